@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheMiss(requests.RequestException):
+    pass
+
+
+class ResponseCache:
+    def __init__(self, path='acmp_cache.sqlite', ttl=7 * 24 * 3600, max_bytes=200 * 1024 * 1024, offline=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def cache_key(url, params=None):
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def load(self, key):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+
+    def touch(self, key, fetched_at=None):
+        now = time.time()
+        with self.lock:
+            if fetched_at is None:
+                self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, key))
+            else:
+                self.conn.execute(
+                    "UPDATE responses SET accessed_at = ?, fetched_at = ? WHERE url = ?", (now, fetched_at, key)
+                )
+            self.conn.commit()
+
+    def store(self, key, response):
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, len(body), response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now)
+            )
+            self.evict()
+            self.conn.commit()
+
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def build_response(self, key, row):
+        body, etag, last_modified, _ = row
+        response = requests.Response()
+        response._content = zlib.decompress(body)
+        response.status_code = 200
+        response.url = key
+        response.headers = CaseInsensitiveDict()
+        if etag:
+            response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = last_modified
+        response.from_cache = True
+        return response
+
+    def lookup(self, url, params=None):
+        key = self.cache_key(url, params)
+        row = self.load(key)
+        if row is None:
+            if self.offline:
+                raise CacheMiss(f"Нет в кэше: {key}")
+            return None
+        if self.offline or time.time() - row[3] < self.ttl:
+            self.touch(key)
+            return self.build_response(key, row)
+        return None
+
+    def fetch(self, session, url, params=None, **kwargs):
+        key = self.cache_key(url, params)
+        row = self.load(key)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+
+        response = session.get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and row is not None:
+            self.touch(key, fetched_at=time.time())
+            return self.build_response(key, row)
+        if response.status_code == 200:
+            self.store(key, response)
+        return response
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,72 @@
+import re
+from collections import Counter
+
+
+CATEGORY_KEYWORDS = {
+    'математика': ['сумма', 'произведение', 'число', 'последовательность', 'делитель', 'простые числа',
+                   'арифметика', 'уравнение', 'формула', 'модуль', 'остаток', 'четность'],
+    'строки': ['строка', 'символ', 'слово', 'текст', 'подстрока', 'палиндром', 'замена', 'поиск'],
+    'графы': ['граф', 'вершина', 'ребро', 'путь', 'связность', 'дерево', 'обход', 'компонента', 'цикл'],
+    'динамическое программирование': ['динамическое', 'динамика', 'dp', 'рекуррент', 'мемоизация'],
+    'перебор': ['перебор', 'комбинация', 'вариант', 'перестановка', 'сочетание', 'брутфорс'],
+    'геометрия': ['точка', 'прямая', 'координата', 'расстояние', 'площадь', 'вектор', 'отрезок', 'треугольник'],
+    'сортировка': ['сортировка', 'упорядочить', 'минимальный', 'максимальный', 'отсортировать', 'ранг'],
+    'поиск': ['поиск', 'бинарный поиск', 'найти', 'поиск в ширину', 'поиск в глубину'],
+    'структуры данных': ['массив', 'список', 'очередь', 'стек', 'дерево', 'хэш', 'множество', 'куча'],
+    'алгоритмы': ['алгоритм', 'эффективный', 'оптимальный', 'сложность', 'время работы'],
+    'рекурсия': ['рекурсия', 'рекурсивный', 'факториал', 'фибоначчи']
+}
+
+DEFAULT_CATEGORY = 'общая'
+
+
+def build_trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def to_pattern(node):
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return to_pattern(trie)
+
+
+KEYWORDS = sorted({keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords})
+KEYWORD_PATTERN = re.compile('(?=(' + build_trie_pattern(KEYWORDS) + '))')
+KEYWORD_PREFIXES = {
+    match: [keyword for keyword in KEYWORDS if match.startswith(keyword)]
+    for match in KEYWORDS
+}
+KEYWORD_CATEGORIES = {
+    keyword: [category for category, keywords in CATEGORY_KEYWORDS.items() if keyword in keywords]
+    for keyword in KEYWORDS
+}
+
+
+def keyword_hits(text):
+    hits = Counter()
+    for match in KEYWORD_PATTERN.finditer(text.lower()):
+        hits.update(KEYWORD_PREFIXES[match.group(1)])
+    return hits
+
+
+def category_scores(text):
+    scores = Counter()
+    for keyword, count in keyword_hits(text).items():
+        for category in KEYWORD_CATEGORIES[keyword]:
+            scores[category] += count
+    return {category: scores[category] for category in CATEGORY_KEYWORDS if scores[category]}
+
+
+def extract_categories(name, description, condition_text):
+    categories = list(category_scores(name + " " + description + " " + condition_text))
+    return categories or [DEFAULT_CATEGORY]
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+
+
+class Checkpoint:
+    def __init__(self, path='scrape_state.json', resume=False):
+        self.path = path
+        self.last_page = 0
+        self.complete = False
+        self.tasks = {}
+        self.categories = {}
+
+        if resume and path and os.path.exists(path):
+            self.load()
+
+        self.resumed = bool(self.tasks)
+        if self.complete:
+            self.last_page = 0
+            self.complete = False
+
+    @staticmethod
+    def fingerprint(*fields):
+        return hashlib.sha1('\x1f'.join(fields).encode('utf-8')).hexdigest()
+
+    @property
+    def start_page(self):
+        return self.last_page + 1
+
+    @property
+    def next_category_id(self):
+        return max(self.categories.values(), default=0) + 1
+
+    def is_current(self, task_id, fingerprint):
+        return self.tasks.get(task_id) == fingerprint
+
+    def mark_task(self, task_id, fingerprint):
+        self.tasks[task_id] = fingerprint
+
+    def mark_page(self, page, complete=False):
+        self.last_page = page
+        self.complete = complete
+
+    def load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.last_page = state.get('last_page', 0)
+        self.complete = state.get('complete', False)
+        self.tasks = state.get('tasks', {})
+        self.categories = state.get('categories', {})
+
+    def save(self):
+        if not self.path:
+            return
+        state = {
+            'last_page': self.last_page,
+            'complete': self.complete,
+            'tasks': self.tasks,
+            'categories': self.categories
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,194 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES = (500, 502, 503, 504)
+THROTTLE_STATUSES = (429,) + RETRY_STATUSES
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(retries=5, backoff=0.5, pool_size=10, status_forcelist=RETRY_STATUSES,
+                   respect_retry_after=True):
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=respect_retry_after,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    def __init__(self, rate=2.0, min_rate=0.2, max_rate=None, increase=0.2, decrease=0.5, target_latency=1.0):
+        super().__init__(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.paused_until = 0.0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                wait = self.paused_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        super().acquire()
+
+    def slow_down(self, pause=None):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if pause:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+                self.tokens = 0.0
+
+    def speed_up(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def feedback(self, latency, response=None):
+        if response is None or response.status_code in THROTTLE_STATUSES:
+            self.slow_down(retry_after_seconds(response) if response is not None else None)
+        elif getattr(response, 'from_cache', False):
+            return
+        elif latency > self.target_latency:
+            self.slow_down()
+        else:
+            self.speed_up()
+
+
+class ConcurrentFetcher:
+    def __init__(self, max_workers=4, per_host=4, rate=2.0, session=None, cache=None, metrics=None,
+                 max_rate=None, min_rate=0.2, target_latency=1.0, retries=5):
+        # throttling statuses are retried here, after the limiter has seen them, not inside urllib3
+        self.session = session or create_session(pool_size=max(10, max_workers), status_forcelist=(),
+                                                   respect_retry_after=False)
+        self.cache = cache
+        self.metrics = metrics
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.limiter = AdaptiveRateLimiter(rate, min_rate=min_rate, max_rate=max_rate, target_latency=target_latency)
+        self.host_slots = {}
+        self.lock = threading.Lock()
+
+    def host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_slots[host]
+
+    def get(self, url, params=None, revalidate=False, **kwargs):
+        # revalidate skips the ttl and always asks the server with If-None-Match / If-Modified-Since
+        if self.cache and (not revalidate or self.cache.offline):
+            cached = self.cache.lookup(url, params)
+            if cached is not None:
+                if self.metrics:
+                    self.metrics.inc('cache_hits_total')
+                return cached
+
+        for _ in range(self.retries + 1):
+            response = self.request(url, params, **kwargs)
+            if response.status_code not in THROTTLE_STATUSES:
+                break
+        return response
+
+    def request(self, url, params=None, **kwargs):
+        with self.host_slot(url):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                if self.cache:
+                    response = self.cache.fetch(self.session, url, params, **kwargs)
+                else:
+                    response = self.session.get(url, params=params, **kwargs)
+            except Exception:
+                self.limiter.feedback(time.perf_counter() - start)
+                if self.metrics:
+                    self.metrics.inc('http_errors_total')
+                    self.metrics.set_gauge('request_rate', self.rate)
+                raise
+
+        latency = time.perf_counter() - start
+        self.limiter.feedback(latency, response)
+        if self.metrics:
+            self.metrics.observe('request_seconds', latency)
+            self.metrics.set_gauge('request_rate', self.rate)
+            self.metrics.inc('http_responses_total', status=response.status_code)
+            self.metrics.inc('downloaded_bytes_total', len(response.content))
+        return response
+
+    @property
+    def rate(self):
+        return self.limiter.rate
+
+    def map(self, func, items):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    def __init__(self):
+        self.samples = []
+        self.total = 0.0
+
+    def observe(self, value):
+        self.samples.append(value)
+        self.total += value
+
+    def quantile(self, q):
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+class Metrics:
+    def __init__(self, prefix='acmp'):
+        self.prefix = prefix
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.tasks = []
+
+    def observe(self, name, value):
+        with self.lock:
+            self.histograms.setdefault(name, Histogram()).observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def record_task(self, task_metrics):
+        with self.lock:
+            self.tasks.append(task_metrics)
+
+    def count(self, name):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            return len(histogram.samples) if histogram else 0
+
+    def total(self, name):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            return histogram.total if histogram else 0.0
+
+    def quantile(self, name, q):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            return histogram.quantile(q) if histogram else 0.0
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'started': self.started,
+                'elapsed_seconds': time.time() - self.started,
+                'histograms': {
+                    name: {
+                        'count': len(histogram.samples),
+                        'sum': histogram.total,
+                        'quantiles': {str(q): histogram.quantile(q) for q in QUANTILES}
+                    }
+                    for name, histogram in self.histograms.items()
+                },
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in self.counters.items()
+                ],
+                'gauges': dict(self.gauges),
+                'tasks': list(self.tasks)
+            }
+
+    def to_prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+        for name, histogram in snapshot['histograms'].items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            for q, value in histogram['quantiles'].items():
+                lines.append(f'{metric}{{quantile="{q}"}} {value}')
+            lines.append(f"{metric}_sum {histogram['sum']}")
+            lines.append(f"{metric}_count {histogram['count']}")
+
+        declared = set()
+        for counter in snapshot['counters']:
+            metric = f"{self.prefix}_{counter['name']}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            labels = ','.join(f'{key}="{value}"' for key, value in counter['labels'].items())
+            lines.append(f"{metric}{{{labels}}} {counter['value']}" if labels else f"{metric} {counter['value']}")
+
+        for name, value in snapshot['gauges'].items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.prom'):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+class ProgressReporter:
+    def __init__(self, total=None, interval=5.0):
+        self.total = total
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def update(self, done, force=False):
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed else 0.0
+        if self.total and rate:
+            eta = f"{(self.total - done) / rate:.0f} с"
+        else:
+            eta = "?"
+        print(f"Прогресс: {done}/{self.total or '?'} задач, {rate:.2f} задач/с, осталось ~{eta}")
@@ -0,0 +1,102 @@
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+
+MAIN_CONTENT_SELECTORS = [('div', 'text'), ('td', 'text'), ('table', 'main')]
+
+
+class SoupDocument:
+    def __init__(self, html, features='html.parser'):
+        self.soup = BeautifulSoup(html, features)
+
+    def table_rows(self, unclassed=True):
+        table = self.soup.find('table', {'class': None}) if unclassed else self.soup.find('table')
+        if not table:
+            return None
+        return [[td.get_text().strip() for td in tr.find_all('td')] for tr in table.find_all('tr')[1:]]
+
+    def links(self):
+        for link in self.soup.find_all('a', href=True):
+            yield link['href'], link.get_text()
+
+    def main_text(self):
+        for tag, css_class in MAIN_CONTENT_SELECTORS:
+            node = self.soup.find(tag, {'class': css_class})
+            if node:
+                return node.get_text(separator='\n', strip=True)
+        return None
+
+    def element_texts(self, tags):
+        for tag in tags:
+            for elem in self.soup.find_all(tag):
+                yield elem.get_text(strip=True)
+
+    def text(self):
+        return self.soup.get_text()
+
+    def paragraphs(self):
+        return [p.get_text() for p in self.soup.find_all('p')]
+
+
+class LexborDocument:
+    def __init__(self, html):
+        self.tree = LexborHTMLParser(html)
+
+    def table_rows(self, unclassed=True):
+        table = self.tree.css_first('table:not([class])' if unclassed else 'table')
+        if table is None:
+            return None
+        return [[td.text().strip() for td in tr.css('td')] for tr in table.css('tr')[1:]]
+
+    def links(self):
+        for link in self.tree.css('a[href]'):
+            yield link.attributes.get('href') or '', link.text()
+
+    def main_text(self):
+        for tag, css_class in MAIN_CONTENT_SELECTORS:
+            node = self.tree.css_first(f'{tag}.{css_class}')
+            if node is not None:
+                return '\n'.join(line for line in node.text(separator='\n', strip=True).split('\n') if line)
+        return None
+
+    def element_texts(self, tags):
+        for tag in tags:
+            for elem in self.tree.css(tag):
+                yield elem.text(strip=True)
+
+    def text(self):
+        return self.tree.root.text() if self.tree.root is not None else ''
+
+    def paragraphs(self):
+        return [p.text() for p in self.tree.css('p')]
+
+
+def available_backends():
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    if lxml is not None:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def parse_html(html, backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'selectolax':
+        return LexborDocument(html)
+    if backend in ('lxml', 'html.parser'):
+        return SoupDocument(html, backend)
+    raise ValueError(f"Неизвестный парсер: {backend}")
@@ -0,0 +1,540 @@
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from acmp_cache import ResponseCache
+from acmp_categories import extract_categories
+from acmp_checkpoint import Checkpoint
+from acmp_http import ConcurrentFetcher, get_session
+from acmp_metrics import Metrics, ProgressReporter
+from acmp_parse import parse_html
+
+BASE_URL = "https://acmp.ru/index.asp"
+TASK_BASE_URL = "https://acmp.ru/index.asp?main=task&id_task="
+
+LISTING_PARAMS = {
+    'main': 'tasks',
+    'str': ' ',
+    'id_type': 0
+}
+
+CONDITION_FIELDS = ['condition_text', 'input_format', 'output_format', 'examples']
+SECTION_FIELDS = dict(zip(['condition', 'input', 'output', 'examples'], CONDITION_FIELDS))
+SECTION_CAPS = {'condition': 2000, 'input': 1000, 'output': 1000, 'examples': 1500}
+
+# a heading is a whole line, so cells like INPUT.TXT in the example table do not switch sections
+HEADING_PATTERN = re.compile(
+    r'\s*(?:(входные данные|входной файл|input(?: data)?)|(выходные данные|выходной файл|output(?: data)?)|'
+    r'(примеры?(?: тестов)?(?: №?\s*\d+)?|examples?|samples?|тесты?))\s*:?\s*$',
+    re.IGNORECASE
+)
+HEADING_SECTIONS = {1: 'input', 2: 'output', 3: 'examples'}
+
+PAGE_LINK_PATTERN = re.compile(r'[?&]page=(\d+)')
+NOT_FOUND = "Не найдено"
+
+TASK_ITEM = 'task'
+RECORD_ITEM = 'record'
+PARSED_ITEM = 'parsed'
+PAGE_END_ITEM = 'page_end'
+DONE_ITEM = 'done'
+
+LISTING_STAGE = 'listing_seconds'
+FETCH_STAGE = 'fetch_seconds'
+PARSE_STAGE = 'parse_seconds'
+CLASSIFY_STAGE = 'classify_seconds'
+WRITE_STAGE = 'write_seconds'
+
+STAGE_LABELS = {
+    LISTING_STAGE: 'листинг',
+    FETCH_STAGE: 'загрузка',
+    PARSE_STAGE: 'разбор',
+    CLASSIFY_STAGE: 'классификация',
+    WRITE_STAGE: 'запись'
+}
+
+
+def scan_pagination(doc):
+    has_next = False
+    max_page = None
+    for href, text in doc.links():
+        match = PAGE_LINK_PATTERN.search(href)
+        if match:
+            has_next = has_next or 'Следующая' in text
+            max_page = max(max_page or 0, int(match.group(1)))
+    return has_next, max_page
+
+
+def listing_task(row):
+    if len(row) < 6 or not row[0].isdigit():
+        return None
+
+    task = {
+        'task_id': row[0],
+        'name': row[1],
+        'description': row[2],
+        'complexity': row[4],
+        'solved_count': row[5]
+    }
+    task['fingerprint'] = Checkpoint.fingerprint(task['name'], task['description'], task['complexity'])
+    return task
+
+
+def parse_condition_text(text):
+    sections = {section: [] for section in SECTION_CAPS}
+    lengths = dict.fromkeys(SECTION_CAPS, 0)
+    open_sections = len(SECTION_CAPS)
+
+    current_section = 'condition'
+    for line in text.split('\n'):
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            current_section = HEADING_SECTIONS[heading.lastindex]
+
+        line = line.strip()
+        if not line or lengths[current_section] > SECTION_CAPS[current_section]:
+            continue
+
+        sections[current_section].append(line)
+        lengths[current_section] += len(line) + 1
+        if lengths[current_section] > SECTION_CAPS[current_section]:
+            open_sections -= 1
+            if not open_sections:
+                break
+
+    return {
+        SECTION_FIELDS[section]: '\n'.join(lines)[:SECTION_CAPS[section]]
+        for section, lines in sections.items()
+    }
+
+
+def extract_alternative_condition(doc):
+    texts = []
+    total_length = 0
+
+    for text in doc.element_texts(['p', 'div', 'td', 'span']):
+        if len(text) > 50:
+            texts.append(text)
+            total_length += len(text) + 1
+            if total_length > 2000:
+                break
+
+    return ' '.join(texts)[:2000]
+
+
+def extract_condition(doc):
+    condition_data = {field: '' for field in CONDITION_FIELDS}
+
+    full_text = doc.main_text()
+    if full_text:
+        condition_data = parse_condition_text(full_text)
+
+        if not condition_data['condition_text']:
+            condition_data['condition_text'] = full_text[:1500]
+
+    if not condition_data['condition_text']:
+        condition_data['condition_text'] = extract_alternative_condition(doc)
+
+    return condition_data
+
+
+def extract_limits(doc):
+    for line in doc.text().split('\n'):
+        line = line.strip()
+        if 'сек' in line and 'Мб' in line:
+            parts = line.split('Память:')
+            if len(parts) > 1:
+                memory_part = parts[1].split('Сложность:')[0]
+                return parts[0].strip(), 'Память:' + memory_part.strip()
+            break
+    return NOT_FOUND, NOT_FOUND
+
+
+def extract_summary(doc):
+    for paragraph in doc.paragraphs():
+        text = paragraph.strip()
+        if text and 'сек' not in text and 'Мб' not in text and len(text) > 50:
+            return text[:200]
+    return ""
+
+
+def parse_task_fields(task, html, parser=None):
+    doc = parse_html(html, parser)
+    record = dict(task)
+    record.update(extract_condition(doc))
+    record['time_limit'], record['memory_limit'] = extract_limits(doc)
+    record['summary'] = extract_summary(doc)
+    return record
+
+
+def classify_record(record):
+    return extract_categories(record['name'], record['description'], record['condition_text'])
+
+
+def parse_task_page(task, html, parser=None):
+    record = parse_task_fields(task, html, parser)
+    record['categories'] = classify_record(record)
+    return record
+
+
+def timed_parse_task_page(task, html, parser=None):
+    start = time.perf_counter()
+    record = parse_task_fields(task, html, parser)
+    parsed = time.perf_counter()
+    record['categories'] = classify_record(record)
+    return record, {PARSE_STAGE: parsed - start, CLASSIFY_STAGE: time.perf_counter() - parsed}
+
+
+def fetch_task_page(task, fetcher=None):
+    print(f"  Загружаем условие задачи {task['task_id']}...")
+
+    get = fetcher.get if fetcher else get_session().get
+    response = get(TASK_BASE_URL + task['task_id'], timeout=10)
+    response.raise_for_status()
+    response.encoding = 'windows-1251'
+    return response
+
+
+def error_record(task, error):
+    print(f"  Ошибка при получении условия задачи {task['task_id']}: {error}")
+    record = dict(task)
+    record.update({
+        'condition_text': f'Ошибка загрузки: {str(error)}',
+        'input_format': 'Ошибка загрузки',
+        'output_format': 'Ошибка загрузки',
+        'examples': 'Ошибка загрузки',
+        'time_limit': NOT_FOUND,
+        'memory_limit': NOT_FOUND,
+        'summary': '',
+        'error': str(error)
+    })
+    record['categories'] = classify_record(record)
+    return record
+
+
+def fetch_task_record(task, fetcher=None, parser=None):
+    try:
+        record = parse_task_page(task, fetch_task_page(task, fetcher).text, parser)
+    except Exception as e:
+        return error_record(task, e)
+
+    print(f"  Условие получено: {len(record['condition_text'])} символов")
+    return record
+
+
+class StagedPipeline:
+    def __init__(self, sinks, fetcher, checkpoint, max_tasks=50, max_pages=None, parser=None,
+                 fetch_workers=4, parse_workers=None, queue_size=64, metrics=None,
+                 metrics_path=None, progress_interval=5.0, shard=None):
+        self.sinks = sinks
+        self.fetcher = fetcher
+        self.checkpoint = checkpoint
+        self.max_tasks = max_tasks
+        self.max_pages = max_pages
+        self.shard = shard
+        self.parser = parser
+        self.fetch_workers = fetch_workers
+        self.parse_workers = os.cpu_count() if parse_workers is None else parse_workers
+        self.pool_broken = False
+
+        self.task_queue = queue.Queue(maxsize=queue_size)
+        self.result_queue = queue.Queue()
+        self.in_flight = threading.BoundedSemaphore(queue_size)
+        self.seq = 0
+
+        self.categories_map = checkpoint.categories
+        self.category_counter = checkpoint.next_category_id
+        self.task_counter = 0
+
+        self.wall_time = 0.0
+        self.metrics = metrics or Metrics()
+        self.metrics_path = metrics_path
+        self.progress = ProgressReporter(max_tasks, progress_interval)
+
+    def emit(self, kind, payload=None):
+        self.in_flight.acquire()
+        seq = self.seq
+        self.seq += 1
+        if kind == TASK_ITEM:
+            self.task_queue.put((seq, payload))
+        else:
+            self.result_queue.put((seq, kind, payload))
+
+    def list_pages(self):
+        try:
+            self.emit_listing()
+        finally:
+            self.emit(DONE_ITEM)
+            for _ in range(self.fetch_workers):
+                self.task_queue.put(None)
+
+    def load_listing(self, page):
+        start = time.perf_counter()
+        try:
+            # listing pages are where changed tasks show up, so they are never served from the cache unchecked
+            response = self.fetcher.get(BASE_URL, params=dict(LISTING_PARAMS, page=page), timeout=10, revalidate=True)
+            response.raise_for_status()
+            response.encoding = 'windows-1251'
+            doc = parse_html(response.text, self.parser)
+        except Exception as e:
+            print(f"Ошибка при загрузке страницы {page}: {e}")
+            return None
+        self.metrics.observe(LISTING_STAGE, time.perf_counter() - start)
+        return doc
+
+    def listing_pages(self, page, last_page=None):
+        doc = self.load_listing(page)
+        while doc is not None:
+            # only the first page and the last known one are scanned; the pages between are known to exist
+            has_next, max_page = scan_pagination(doc)
+            yield page, doc, not has_next
+            if not has_next or (last_page is not None and page >= last_page):
+                return
+
+            end = max_page or 0
+            if last_page is not None:
+                end = min(end, last_page)
+            if end > page + 1:
+                page, doc = yield from self.prefetch_listing(page + 1, end)
+            else:
+                page += 1
+                doc = self.load_listing(page)
+
+    def prefetch_listing(self, page, end):
+        window = deque()
+        executor = ThreadPoolExecutor(self.fetcher.max_workers)
+        try:
+            while True:
+                while page <= end and len(window) < self.fetcher.max_workers * 2:
+                    window.append((page, executor.submit(self.load_listing, page)))
+                    page += 1
+
+                current, future = window.popleft()
+                doc = future.result()
+                if doc is None or current == end:
+                    return current, doc
+                yield current, doc, False
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def emit_listing(self):
+        emitted = 0
+        first_page = self.checkpoint.start_page
+        last_page = None
+        if self.shard:
+            first_page = max(first_page, self.shard.first_page)
+            last_page = self.shard.last_page
+        if self.max_pages is not None:
+            max_pages_end = first_page + self.max_pages - 1
+            last_page = max_pages_end if last_page is None else min(last_page, max_pages_end)
+
+        for page, doc, final in self.listing_pages(first_page, last_page):
+            print(f"Обрабатывается страница {page}...")
+
+            rows = doc.table_rows()
+            if rows is None:
+                print("Таблица с задачами не найдена")
+                break
+
+            final = final or (self.shard is not None and self.shard.is_last_page(page))
+
+            truncated = False
+            for row in rows:
+                if self.max_tasks is not None and emitted >= self.max_tasks:
+                    truncated = True
+                    break
+
+                task = listing_task(row)
+                if task is None or self.checkpoint.is_current(task['task_id'], task['fingerprint']):
+                    continue
+                if self.shard and not self.shard.includes_task(task['task_id']):
+                    continue
+                self.emit(TASK_ITEM, task)
+                emitted += 1
+
+            self.emit(PAGE_END_ITEM, (page, truncated, final))
+
+            if final:
+                print("Достигнута последняя страница")
+                break
+            if self.max_tasks is not None and emitted >= self.max_tasks:
+                break
+
+    def fetch_worker(self, parse_pool):
+        while True:
+            item = self.task_queue.get()
+            if item is None:
+                return
+            seq, task = item
+            task_metrics = {'task_id': task['task_id']}
+
+            start = time.perf_counter()
+            try:
+                response = fetch_task_page(task, self.fetcher)
+                task_metrics['status'] = response.status_code
+                task_metrics['bytes'] = len(response.content)
+                task_metrics['from_cache'] = getattr(response, 'from_cache', False)
+                html = response.text
+            except Exception as e:
+                self.result_queue.put((seq, RECORD_ITEM, (error_record(task, e), task_metrics)))
+                continue
+            finally:
+                task_metrics[FETCH_STAGE] = time.perf_counter() - start
+                self.metrics.observe(FETCH_STAGE, task_metrics[FETCH_STAGE])
+
+            future = self.parse(parse_pool, task, html)
+            self.result_queue.put((seq, PARSED_ITEM, (task, html, future, task_metrics)))
+
+    def parse(self, parse_pool, task, html):
+        if parse_pool and not self.pool_broken:
+            try:
+                return parse_pool.submit(timed_parse_task_page, task, html, self.parser)
+            except BrokenProcessPool:
+                self.pool_broken = True
+                print("Процесс разбора аварийно завершился, страницы разбираются в потоках загрузки")
+
+        future = Future()
+        try:
+            future.set_result(timed_parse_task_page(task, html, self.parser))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def write_results(self):
+        pending = {}
+        next_seq = 0
+        while True:
+            seq, kind, payload = self.result_queue.get()
+            pending[seq] = (kind, payload)
+            while next_seq in pending:
+                kind, payload = pending.pop(next_seq)
+                next_seq += 1
+                if kind == DONE_ITEM:
+                    return
+                if kind == PAGE_END_ITEM:
+                    self.end_page(*payload)
+                else:
+                    self.write_record(*self.resolve(kind, payload))
+                self.in_flight.release()
+
+    def resolve(self, kind, payload):
+        if kind == RECORD_ITEM:
+            return payload
+
+        task, html, future, task_metrics = payload
+        # the page itself downloaded fine, so a crashed parse process only moves its parsing here
+        if isinstance(future.exception(), BrokenProcessPool):
+            future = self.parse(None, task, html)
+        try:
+            record, timings = future.result()
+        except Exception as e:
+            return error_record(task, e), task_metrics
+
+        for stage, elapsed in timings.items():
+            self.metrics.observe(stage, elapsed)
+        task_metrics.update(timings)
+        print(f"  Условие получено: {len(record['condition_text'])} символов")
+        return record, task_metrics
+
+    def write_record(self, record, task_metrics):
+        print(f"Обрабатывается задача {self.task_counter + 1}/{self.max_tasks or '?'}: {record['task_id']} - {record['name']}")
+
+        start = time.perf_counter()
+        record['category_ids'] = []
+        for category in record['categories']:
+            if category not in self.categories_map:
+                self.categories_map[category] = self.category_counter
+                for sink in self.sinks:
+                    sink.write_category(self.category_counter, category)
+                self.category_counter += 1
+            record['category_ids'].append(self.categories_map[category])
+
+        for sink in self.sinks:
+            sink.write_task(record)
+
+        if 'error' not in record:
+            self.checkpoint.mark_task(record['task_id'], record['fingerprint'])
+        else:
+            task_metrics['error'] = record['error']
+            self.metrics.inc('task_errors_total')
+        self.task_counter += 1
+
+        task_metrics[WRITE_STAGE] = time.perf_counter() - start
+        self.metrics.observe(WRITE_STAGE, task_metrics[WRITE_STAGE])
+        self.metrics.record_task(task_metrics)
+        self.metrics.inc('tasks_total')
+        self.progress.update(self.task_counter)
+
+    def end_page(self, page, truncated, last_page):
+        for sink in self.sinks:
+            sink.flush()
+        if not truncated:
+            self.checkpoint.mark_page(page, complete=last_page)
+        self.checkpoint.save()
+        self.metrics.set_gauge('last_page', page)
+
+    def run(self):
+        for sink in self.sinks:
+            sink.open(append=self.checkpoint.resumed)
+
+        parse_pool = ProcessPoolExecutor(self.parse_workers) if self.parse_workers else None
+        threads = [threading.Thread(target=self.list_pages, daemon=True)]
+        threads += [threading.Thread(target=self.fetch_worker, args=(parse_pool,), daemon=True)
+                    for _ in range(self.fetch_workers)]
+
+        start = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            self.write_results()
+            for thread in threads:
+                thread.join()
+        finally:
+            if parse_pool:
+                parse_pool.shutdown(cancel_futures=True)
+        self.wall_time = time.perf_counter() - start
+
+        for sink in self.sinks:
+            sink.close(self.categories_map)
+
+        self.progress.update(self.task_counter, force=True)
+        self.report()
+        if self.metrics_path:
+            self.metrics.dump(self.metrics_path)
+            print(f"Метрики сохранены в {self.metrics_path}")
+
+    def report(self):
+        print(f"Этапы за {self.wall_time:.2f} с:")
+        for stage, label in STAGE_LABELS.items():
+            count = self.metrics.count(stage)
+            rate = count / self.wall_time if self.wall_time else 0.0
+            print(f"  {label}: {count} шт., {rate:.2f}/с, занято {self.metrics.total(stage):.2f} с, "
+                  f"p50 {self.metrics.quantile(stage, 0.5) * 1000:.1f} мс, p90 {self.metrics.quantile(stage, 0.9) * 1000:.1f} мс")
+        print(f"  темп запросов: {self.fetcher.rate:.2f}/с")
+
+
+def build_pipeline(sinks, max_tasks=50, max_pages=None, max_workers=4, per_host=4, rate=2.0, max_rate=None,
+                   target_latency=1.0, cache_path='acmp_cache.sqlite', offline=False, resume=False,
+                   checkpoint_path='scrape_state.json', parser=None, parse_workers=None, queue_size=64,
+                   session=None, metrics_path=None, progress_interval=5.0, shard=None):
+    metrics = Metrics()
+    cache = ResponseCache(cache_path, offline=offline) if cache_path else None
+    fetcher = ConcurrentFetcher(max_workers=max_workers, per_host=per_host, rate=rate, session=session, cache=cache,
+                                metrics=metrics, max_rate=max_rate, target_latency=target_latency)
+    checkpoint = Checkpoint(checkpoint_path, resume=resume)
+
+    return StagedPipeline(sinks, fetcher, checkpoint, max_tasks=max_tasks, max_pages=max_pages, parser=parser,
+                          fetch_workers=max_workers, parse_workers=parse_workers, queue_size=queue_size,
+                          metrics=metrics, metrics_path=metrics_path, progress_interval=progress_interval,
+                          shard=shard)
+
+
+def run_pipeline(sinks, **options):
+    pipeline = build_pipeline(sinks, **options)
+    pipeline.run()
+    return pipeline.task_counter, pipeline.categories_map
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from acmp_categories import CATEGORY_KEYWORDS, DEFAULT_CATEGORY
+from acmp_pipeline import run_pipeline
+from acmp_sinks import CONDITION_HEADER, CsvSink, SqliteSink
+
+SHARDS_DIR = 'shards'
+CATEGORY_ORDER = list(CATEGORY_KEYWORDS) + [DEFAULT_CATEGORY]
+
+
+class ShardSpec:
+    def __init__(self, first_page=1, last_page=None, modulo=None, remainder=0):
+        self.first_page = first_page
+        self.last_page = last_page
+        self.modulo = modulo
+        self.remainder = remainder
+
+    @classmethod
+    def parse(cls, text):
+        spec = cls()
+        for part in text.split(','):
+            key, _, value = part.strip().partition('=')
+            if key == 'pages':
+                first, _, last = value.partition('-')
+                spec.first_page = int(first) if first else 1
+                spec.last_page = int(last) if last else None
+            elif key == 'mod':
+                remainder, _, modulo = value.partition('/')
+                spec.remainder = int(remainder)
+                spec.modulo = int(modulo)
+            else:
+                raise ValueError(f"Неизвестная часть описания шарда: {part!r}")
+
+        if spec.first_page < 1 or (spec.last_page is not None and spec.last_page < spec.first_page):
+            raise ValueError(f"Неверный диапазон страниц: {text!r}")
+        if spec.modulo is not None and not 0 <= spec.remainder < spec.modulo:
+            raise ValueError(f"Неверный остаток шарда: {text!r}")
+        return spec
+
+    @property
+    def name(self):
+        name = f"pages_{self.first_page}-{self.last_page or ''}"
+        if self.modulo is not None:
+            name += f"_mod_{self.remainder}of{self.modulo}"
+        return name
+
+    def is_last_page(self, page):
+        return self.last_page is not None and page >= self.last_page
+
+    def includes_task(self, task_id):
+        return self.modulo is None or int(task_id) % self.modulo == self.remainder
+
+
+def modulo_shards(count):
+    return [ShardSpec(modulo=count, remainder=remainder) for remainder in range(count)]
+
+
+def prepare_shard(shard, options, base_dir=SHARDS_DIR):
+    if isinstance(shard, str):
+        shard = ShardSpec.parse(shard)
+    directory = os.path.join(base_dir, shard.name)
+    os.makedirs(directory, exist_ok=True)
+
+    options['shard'] = shard
+    options.setdefault('checkpoint_path', os.path.join(directory, 'scrape_state.json'))
+    return directory
+
+
+def scrape_shard(shard, max_tasks=None, base_dir=SHARDS_DIR, **options):
+    directory = prepare_shard(shard, options, base_dir)
+    task_counter, _ = run_pipeline([CsvSink(directory=directory)], max_tasks=max_tasks, **options)
+    return directory, task_counter
+
+
+def read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    return rows[1:]
+
+
+def category_sort_key(name):
+    if name in CATEGORY_ORDER:
+        return 0, CATEGORY_ORDER.index(name), name
+    return 1, 0, name
+
+
+def read_shard(directory):
+    categories = {row[0]: row[1] for row in read_rows(os.path.join(directory, 'categories.csv'))}
+    conditions = {row[0]: row[1:5] for row in read_rows(os.path.join(directory, 'task_conditions.csv'))}
+
+    task_categories = {}
+    for task_id, category_id in read_rows(os.path.join(directory, 'task_categories.csv')):
+        names = task_categories.setdefault(task_id, [])
+        if categories[category_id] not in names:
+            names.append(categories[category_id])
+
+    records = {}
+    for task_id, name, complexity, solved_count, description in read_rows(os.path.join(directory, 'tasks.csv')):
+        condition = conditions.get(task_id, [''] * 4)
+        records[task_id] = {
+            'task_id': task_id,
+            'name': name,
+            'complexity': complexity,
+            'solved_count': solved_count,
+            'description': description,
+            'condition_text': condition[0],
+            'input_format': condition[1],
+            'output_format': condition[2],
+            'examples': condition[3],
+            'categories': task_categories.get(task_id, [])
+        }
+    return records
+
+
+def merge_shards(directories, out_dir='.', condition_header=CONDITION_HEADER, sqlite_path=None):
+    records = {}
+    for directory in directories:
+        records.update(read_shard(directory))
+
+    names = {name for record in records.values() for name in record['categories']}
+    categories_map = {name: category_id for category_id, name in enumerate(sorted(names, key=category_sort_key), 1)}
+
+    sinks = [CsvSink(condition_header, directory=out_dir)]
+    if sqlite_path:
+        sinks.append(SqliteSink(sqlite_path))
+    for sink in sinks:
+        sink.open()
+        for name, category_id in categories_map.items():
+            sink.write_category(category_id, name)
+
+    for task_id in sorted(records, key=lambda task_id: int(task_id) if task_id.isdigit() else 0):
+        record = records[task_id]
+        record['category_ids'] = [categories_map[name] for name in record['categories']]
+        for sink in sinks:
+            sink.write_task(record)
+
+    for sink in sinks:
+        sink.close(categories_map)
+
+    print(f"Объединено шардов: {len(directories)}, задач: {len(records)}, категорий: {len(categories_map)}")
+    return len(records), categories_map
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Параллельный сбор задач acmp.ru по шардам")
+    arg_parser.add_argument('--shard', action='append', default=[],
+                            help="описание шарда: pages=1-20, mod=0/4 или pages=1-20,mod=0/4")
+    arg_parser.add_argument('--mod', type=int, default=0, help="разбить задачи на N шардов по остатку id")
+    arg_parser.add_argument('--max-tasks', type=int, default=None, help="ограничение на число задач в шарде")
+    arg_parser.add_argument('--processes', type=int, default=None)
+    arg_parser.add_argument('--base-dir', default=SHARDS_DIR)
+    arg_parser.add_argument('--out', default='.', help="каталог для объединённых CSV")
+    arg_parser.add_argument('--sqlite', default=None, help="также записать объединённые данные в SQLite")
+    arg_parser.add_argument('--merge-only', action='store_true', help="только объединить уже собранные шарды")
+    args = arg_parser.parse_args()
+
+    shards = [ShardSpec.parse(text) for text in args.shard] + modulo_shards(args.mod)
+    if args.merge_only:
+        directories = sorted(os.path.join(args.base_dir, name) for name in os.listdir(args.base_dir))
+    else:
+        if not shards:
+            arg_parser.error("нужно указать --shard или --mod")
+        with ProcessPoolExecutor(args.processes or len(shards)) as executor:
+            futures = [executor.submit(scrape_shard, shard, args.max_tasks, args.base_dir, parse_workers=0)
+                       for shard in shards]
+            directories = []
+            for future in futures:
+                directory, task_counter = future.result()
+                print(f"Шард {directory}: {task_counter} задач")
+                directories.append(directory)
+
+    os.makedirs(args.out, exist_ok=True)
+    merge_shards(directories, args.out, sqlite_path=args.sqlite)
+
+
+if __name__ == "__main__":
+    main()
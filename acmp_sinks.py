@@ -0,0 +1,331 @@
+import csv
+import json
+import os
+import time
+
+import yaml
+
+from acmp_storage import SqliteStore
+
+YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CONDITION_HEADER = ['task_id', 'condition_text', 'input_format', 'output_format', 'examples']
+CONDITION_HEADER_RU = ['task_id', 'условие_задачи', 'входные_данные', 'выходные_данные', 'примеры']
+
+
+def condition_row(record):
+    return [record['condition_text'], record['input_format'], record['output_format'], record['examples']]
+
+
+class CsvSink:
+    # rows keyed by task_id in the first column; a resumed run replaces the rows of the tasks it writes again
+    MERGED = ['tasks.csv', 'task_conditions.csv', 'task_categories.csv']
+
+    def __init__(self, condition_header=CONDITION_HEADER, directory='.'):
+        self.condition_header = condition_header
+        self.directory = directory
+        self.files = []
+
+    def open_csv(self, name, mode, header):
+        path = os.path.join(self.directory, name)
+        if mode == 'a' and name in self.MERGED and os.path.exists(path) and os.path.getsize(path):
+            # new rows wait in a side file; close merges them over the earlier rows of the same tasks
+            path += '.part'
+            header = None
+        output_file = open(path, mode, newline='', encoding='utf-8')
+        self.files.append(output_file)
+        writer = csv.writer(output_file)
+        if header and output_file.tell() == 0:
+            writer.writerow(header)
+        return writer
+
+    def open(self, append=False):
+        mode = 'a' if append else 'w'
+        if append:
+            # a resumed run that stopped early left its rows in the side files
+            self.merge_parts()
+        self.tasks_writer = self.open_csv('tasks.csv', mode, ['task_id', 'name', 'complexity', 'solved_count', 'description'])
+        self.cats_writer = self.open_csv('categories.csv', mode, ['category_id', 'category_name'])
+        self.task_cats_writer = self.open_csv('task_categories.csv', mode, ['task_id', 'category_id'])
+        self.conditions_writer = self.open_csv('task_conditions.csv', mode, self.condition_header)
+
+    def merge_parts(self):
+        tasks_part = os.path.join(self.directory, 'tasks.csv.part')
+        if not os.path.exists(tasks_part):
+            return
+        with open(tasks_part, newline='', encoding='utf-8') as part_file:
+            replaced = {row[0] for row in csv.reader(part_file) if row}
+
+        for name in self.MERGED:
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path + '.part'):
+                continue
+            with open(path + '.tmp', 'w', newline='', encoding='utf-8') as output_file:
+                writer = csv.writer(output_file)
+                if os.path.exists(path):
+                    with open(path, newline='', encoding='utf-8') as old_file:
+                        rows = csv.reader(old_file)
+                        header = next(rows, None)
+                        if header:
+                            writer.writerow(header)
+                        writer.writerows(row for row in rows if row and row[0] not in replaced)
+                with open(path + '.part', newline='', encoding='utf-8') as part_file:
+                    writer.writerows(csv.reader(part_file))
+            os.replace(path + '.tmp', path)
+            os.remove(path + '.part')
+
+    def write_category(self, category_id, category_name):
+        self.cats_writer.writerow([category_id, category_name])
+
+    def write_task(self, record):
+        task_id = record['task_id']
+        self.tasks_writer.writerow([task_id, record['name'], record['complexity'], record['solved_count'], record['description']])
+        self.conditions_writer.writerow([task_id] + condition_row(record))
+        for category_id in record['category_ids']:
+            self.task_cats_writer.writerow([task_id, category_id])
+
+    def flush(self):
+        for output_file in self.files:
+            output_file.flush()
+
+    def close(self, categories_map):
+        for output_file in self.files:
+            output_file.close()
+        self.files = []
+        self.merge_parts()
+
+
+def load_yaml_entry(block):
+    if not block:
+        return []
+    try:
+        return yaml.load(''.join(block), Loader=YAML_LOADER) or []
+    except yaml.YAMLError:
+        # an interrupted run can leave the last entry half written
+        return []
+
+
+def read_yaml_tasks(path):
+    # tasks are the "- " blocks at the start of a line; the header and the totals are top-level keys
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as yaml_file:
+        block = []
+        for line in yaml_file:
+            if block and (line.startswith(' ') or line == '\n'):
+                block.append(line)
+                continue
+            yield from load_yaml_entry(block)
+            block = [line] if line.startswith('- ') else []
+        yield from load_yaml_entry(block)
+
+
+class YamlSink:
+    def __init__(self, path='full_tasks.yaml'):
+        self.path = path
+        self.part_path = path + '.part'
+        self.task_count = 0
+        self.merging = False
+
+    def dump(self, data):
+        yaml.dump(data, self.yaml_file, Dumper=YAML_DUMPER, allow_unicode=True, default_flow_style=False, indent=2)
+
+    def open(self, append=False):
+        if append:
+            # a resumed run that stopped early left its tasks in the side file
+            self.merge_part()
+        # the totals are written at the end, so a resumed run keeps its tasks in a side file
+        # and close merges them over the earlier entries with the same id
+        self.merging = append and os.path.exists(self.path)
+        if self.merging:
+            self.yaml_file = open(self.part_path, 'w', encoding='utf-8')
+        else:
+            self.yaml_file = open(self.path, 'w', encoding='utf-8')
+            self.write_header()
+
+    def write_header(self):
+        self.task_count = 0
+        self.dump({
+            'источник': 'https://acmp.ru',
+            'время_сбора': time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    def write_category(self, category_id, category_name):
+        pass
+
+    def write_task(self, record):
+        task_data = {
+            'id': record['task_id'],
+            'название': record['name'],
+            'сложность': record['complexity'],
+            'решили': record['solved_count'],
+            'описание': record['description'],
+            'условие': record['condition_text'],
+            'входные_данные': record['input_format'],
+            'выходные_данные': record['output_format'],
+            'примеры': record['examples'],
+            'категории': record['categories']
+        }
+        if self.merging:
+            self.dump([task_data])
+        else:
+            self.write_task_data(task_data)
+
+    def write_task_data(self, task_data):
+        if self.task_count == 0:
+            self.yaml_file.write('задачи:\n')
+        self.dump([task_data])
+        self.task_count += 1
+
+    def merge_part(self, categories_map=None):
+        if not os.path.exists(self.part_path):
+            return
+        replaced = {task_data['id'] for task_data in read_yaml_tasks(self.part_path)}
+        self.yaml_file = open(self.path + '.tmp', 'w', encoding='utf-8')
+        self.write_header()
+        for task_data in read_yaml_tasks(self.path):
+            if task_data['id'] not in replaced:
+                self.write_task_data(task_data)
+        for task_data in read_yaml_tasks(self.part_path):
+            self.write_task_data(task_data)
+        if categories_map is not None:
+            self.write_totals(categories_map)
+        self.yaml_file.close()
+        os.replace(self.path + '.tmp', self.path)
+        os.remove(self.part_path)
+
+    def write_totals(self, categories_map):
+        if self.task_count == 0:
+            self.dump({'задачи': []})
+        self.dump({
+            'всего_задач': self.task_count,
+            'всего_категорий': len(categories_map),
+            'категории': {v: k for k, v in categories_map.items()}
+        })
+
+    def flush(self):
+        self.yaml_file.flush()
+
+    def close(self, categories_map):
+        if self.merging:
+            self.yaml_file.close()
+            self.merge_part(categories_map)
+            return
+        self.write_totals(categories_map)
+        self.yaml_file.close()
+
+
+def read_json_tasks(path):
+    # every task object starts with "  {" and ends with "  }" on their own lines
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as json_file:
+        block = []
+        for line in json_file:
+            if line.rstrip() == '  {':
+                block = [line]
+            elif block:
+                block.append(line)
+                if line.rstrip() in ('  }', '  },'):
+                    yield json.loads(''.join(block).rstrip().rstrip(','))
+                    block = []
+        # an unfinished block is the object an interrupted run was writing; it was never checkpointed
+
+
+class JsonSink:
+    def __init__(self, path='tasks.json'):
+        self.path = path
+        self.part_path = path + '.part'
+        self.task_count = 0
+        self.merging = False
+
+    def open(self, append=False):
+        if append:
+            self.merge_part()
+        # like YamlSink, a resumed run writes to a side file that close merges over the earlier objects
+        self.merging = append and os.path.exists(self.path)
+        if self.merging:
+            self.json_file = open(self.part_path, 'w', encoding='utf-8')
+        else:
+            self.json_file = open(self.path, 'w', encoding='utf-8')
+            self.json_file.write('[')
+
+    def write_category(self, category_id, category_name):
+        pass
+
+    def write_task(self, record):
+        task = {
+            "id": record['task_id'],
+            "complexity": record['complexity'],
+            "name": record['name'],
+            "description": record['description'],
+            "time": record['time_limit'],
+            "memory": record['memory_limit'],
+            "condition": record['summary']
+        }
+        if self.merging:
+            self.json_file.write('  ' + self.format_task(task) + '\n')
+        else:
+            self.write_task_data(task)
+
+    def format_task(self, task):
+        return json.dumps(task, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+
+    def write_task_data(self, task):
+        self.json_file.write((',\n  ' if self.task_count else '\n  ') + self.format_task(task))
+        self.task_count += 1
+
+    def merge_part(self):
+        if not os.path.exists(self.part_path):
+            return
+        replaced = {task['id'] for task in read_json_tasks(self.part_path)}
+        self.json_file = open(self.path + '.tmp', 'w', encoding='utf-8')
+        self.json_file.write('[')
+        self.task_count = 0
+        for task in read_json_tasks(self.path):
+            if task['id'] not in replaced:
+                self.write_task_data(task)
+        for task in read_json_tasks(self.part_path):
+            self.write_task_data(task)
+        self.json_file.write('\n]' if self.task_count else ']')
+        self.json_file.close()
+        os.replace(self.path + '.tmp', self.path)
+        os.remove(self.part_path)
+
+    def flush(self):
+        self.json_file.flush()
+
+    def close(self, categories_map):
+        if self.merging:
+            self.json_file.close()
+            self.merge_part()
+            return
+        self.json_file.write('\n]' if self.task_count else ']')
+        self.json_file.close()
+
+
+class SqliteSink:
+    def __init__(self, path='tasks.sqlite', batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+
+    def open(self, append=False):
+        self.store = SqliteStore(self.path, self.batch_size)
+        if not append:
+            self.store.clear()
+
+    def write_category(self, category_id, category_name):
+        self.store.write_category(category_id, category_name)
+
+    def write_task(self, record):
+        self.store.write_task(record['task_id'], record['name'], record['complexity'], record['solved_count'],
+                              record['description'], condition_row(record), record['category_ids'])
+
+    def flush(self):
+        self.store.commit()
+
+    def close(self, categories_map):
+        for category, category_id in categories_map.items():
+            self.store.write_category(category_id, category)
+        self.store.close()
@@ -0,0 +1,129 @@
+import re
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    complexity TEXT,
+    complexity_pct INTEGER,
+    solved_count INTEGER,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS conditions (
+    task_id INTEGER PRIMARY KEY REFERENCES tasks (task_id),
+    condition_text TEXT,
+    input_format TEXT,
+    output_format TEXT,
+    examples TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    category_id INTEGER PRIMARY KEY,
+    category_name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS task_categories (
+    task_id INTEGER NOT NULL REFERENCES tasks (task_id),
+    category_id INTEGER NOT NULL REFERENCES categories (category_id),
+    PRIMARY KEY (task_id, category_id)
+);
+CREATE INDEX IF NOT EXISTS task_categories_category ON task_categories (category_id, task_id);
+CREATE INDEX IF NOT EXISTS tasks_complexity ON tasks (complexity_pct);
+CREATE INDEX IF NOT EXISTS tasks_solved ON tasks (solved_count);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS conditions_fts USING fts5 (
+    task_id UNINDEXED,
+    condition_text,
+    tokenize = 'unicode61'
+)
+"""
+
+TABLES = ['tasks', 'conditions', 'categories', 'task_categories']
+
+
+def to_int(text):
+    digits = re.sub(r'\D', '', text or '')
+    return int(digits) if digits else None
+
+
+class SqliteStore:
+    def __init__(self, path='tasks.sqlite', batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.execute(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self.conn.commit()
+
+    def write_category(self, category_id, category_name):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO categories (category_id, category_name) VALUES (?, ?)",
+            (category_id, category_name)
+        )
+
+    def write_task(self, task_id, name, complexity, solved_count, description, condition, category_ids):
+        task_id = int(task_id)
+        condition_text, input_format, output_format, examples = condition
+        self.conn.execute(
+            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+            (task_id, name, complexity, to_int(complexity), to_int(solved_count), description)
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO conditions VALUES (?, ?, ?, ?, ?)",
+            (task_id, condition_text, input_format, output_format, examples)
+        )
+        self.conn.execute("DELETE FROM task_categories WHERE task_id = ?", (task_id,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO task_categories VALUES (?, ?)",
+            [(task_id, category_id) for category_id in category_ids]
+        )
+        if self.fts:
+            self.conn.execute("DELETE FROM conditions_fts WHERE task_id = ?", (task_id,))
+            self.conn.execute("INSERT INTO conditions_fts VALUES (?, ?)", (task_id, condition_text))
+
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.commit()
+
+    def clear(self):
+        for table in TABLES:
+            self.conn.execute(f"DELETE FROM {table}")
+        if self.fts:
+            self.conn.execute("DELETE FROM conditions_fts")
+        self.conn.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def export_parquet(db_path='tasks.sqlite', out_dir='.'):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Для экспорта в Parquet нужен пакет pyarrow")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        for table in TABLES:
+            cursor = conn.execute(f"SELECT * FROM {table}")
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+            data = {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+            pq.write_table(pa.table(data), f"{out_dir}/{table}.parquet")
+    finally:
+        conn.close()
@@ -0,0 +1,63 @@
+import glob
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import zlib
+
+from acmp_parse import available_backends, parse_html
+
+
+def load_pages(source):
+    if os.path.isdir(source):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(source, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read().decode('windows-1251', errors='replace'))
+        return pages
+
+    conn = sqlite3.connect(source)
+    try:
+        return [zlib.decompress(body).decode('windows-1251', errors='replace')
+                for (body,) in conn.execute("SELECT body FROM responses")]
+    finally:
+        conn.close()
+
+
+def extract(doc):
+    doc.table_rows()
+    doc.main_text()
+    for href, text in doc.links():
+        pass
+
+
+def bench_backend(backend, pages, repeat=3):
+    timings = []
+    for html in pages:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract(parse_html(html, backend))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best * 1000)
+    return timings
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else 'acmp_cache.sqlite'
+    pages = load_pages(source)
+    if not pages:
+        print(f"Нет сохранённых страниц в {source}")
+        return
+
+    print(f"Страниц: {len(pages)}")
+    print(f"{'парсер':<12} {'среднее, мс':>12} {'медиана, мс':>12} {'макс, мс':>10}")
+    for backend in available_backends():
+        timings = bench_backend(backend, pages)
+        print(f"{backend:<12} {statistics.mean(timings):>12.2f} {statistics.median(timings):>12.2f} {max(timings):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from rogalik import FOV_MODES, Roguelike, np
+from rogalik_mapgen import generate_cave
+from rogalik_path import UNREACHABLE
+from rogalik_save import load_game, save_game
+
+
+def open_game(size, radius, fov_mode, use_numpy, incremental_fov=True):
+    game = Roguelike(size, size, fov_radius=radius, use_numpy=use_numpy, fov_mode=fov_mode,
+                     incremental_fov=incremental_fov)
+    if game.use_numpy:
+        game.map[1:-1, 1:-1] = game.FLOOR
+        return game
+    for y in range(1, size - 1):
+        game.map[y][1:-1] = [game.FLOOR] * (size - 2)
+    return game
+
+
+def open_fov(radius, fov_mode, use_numpy, repeats=20):
+    size = 2 * radius + 3
+    game = open_game(size, radius, fov_mode, use_numpy)
+    game.playerX = game.playerY = size // 2
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        game.update_fov()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    gaps = 0
+    for y in range(size):
+        for x in range(size):
+            dx, dy = x - game.playerX, y - game.playerY
+            if dx * dx + dy * dy <= radius * radius and not game.is_visible(x, y):
+                gaps += 1
+    return sorted(samples)[repeats // 2], gaps
+
+
+def time_fov(radius, fov_mode, use_numpy, size, moves, seed):
+    game = Roguelike(size, size, fov_radius=radius, use_numpy=use_numpy, fov_mode=fov_mode, seed=seed)
+    rng = random.Random(seed)
+    floor = [(x, y) for y in range(size) for x in range(size) if game.map[y][x] != game.WALL]
+
+    samples = []
+    for _ in range(moves):
+        game.playerX, game.playerY = rng.choice(floor)
+        start = time.perf_counter()
+        game.update_fov()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+
+def time_moves(size, radius, fov_mode, use_numpy, incremental_fov, steps, seed):
+    game = open_game(size, radius, fov_mode, use_numpy, incremental_fov)
+    rng = random.Random(seed)
+    game.update_fov()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        game.move_player(*rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)]))
+    return (time.perf_counter() - start) * 1000 / steps
+
+
+def time_mapgen(cells, seed):
+    side = int(cells ** 0.5)
+    start = time.perf_counter()
+    walls, _, _ = generate_cave(side, side, seed)
+    elapsed = time.perf_counter() - start
+    return side, elapsed, float((~walls).mean())
+
+
+def time_save(size, use_numpy, seed):
+    game = Roguelike(size, size, use_numpy=use_numpy, seed=seed)
+    path = os.path.join(tempfile.mkdtemp(prefix='rogalik_save_'), 'game.sav')
+    start = time.perf_counter()
+    save_game(game, path)
+    saved = time.perf_counter()
+    load_game(path, use_numpy=use_numpy)
+    loaded = time.perf_counter()
+    file_size = os.path.getsize(path)
+    os.remove(path)
+    return saved - start, loaded - saved, file_size
+
+
+def time_paths(size, use_numpy, queries, entities, seed):
+    game = Roguelike(size, size, use_numpy=use_numpy, seed=seed)
+    grid = game.paths()
+    rng = random.Random(seed)
+    floor = [cell for cell, wall in enumerate(grid.blocked) if not wall]
+    start = (game.playerX, game.playerY)
+
+    begin = time.perf_counter()
+    for _ in range(queries):
+        grid.path(grid.point(rng.choice(floor)), grid.point(rng.choice(floor)))
+    astar_time = (time.perf_counter() - begin) / queries
+
+    begin = time.perf_counter()
+    dijkstra_map = grid.distance_map([start])
+    full_time = time.perf_counter() - begin
+
+    changes = [rng.choice(floor) for _ in range(queries)]
+    begin = time.perf_counter()
+    for cell in changes:
+        grid.set_blocked(*grid.point(cell), True)
+        grid.set_blocked(*grid.point(cell), False)
+    update_time = (time.perf_counter() - begin) / (2 * queries)
+
+    walkers = [cell for cell in rng.sample(floor, min(entities, len(floor)))
+               if dijkstra_map.distance[cell] != UNREACHABLE]
+    turns = 0
+    begin = time.perf_counter()
+    while turns < 100:
+        walkers = [dijkstra_map.downhill(cell) or cell for cell in walkers]
+        turns += 1
+    entity_rate = len(walkers) * turns / (time.perf_counter() - begin)
+    return astar_time, full_time, update_time, entity_rate
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк режимов обзора Roguelike")
+    arg_parser.add_argument('--radius', type=int, nargs='+', default=[5, 20, 50])
+    arg_parser.add_argument('--size', type=int, default=200, help="сторона карты для замеров времени")
+    arg_parser.add_argument('--moves', type=int, default=200)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    arg_parser.add_argument('--lists', action='store_true', help="хранить карту в списках, а не в массивах numpy")
+    arg_parser.add_argument('--move-sizes', type=int, nargs='+', default=[100, 1000, 3000],
+                            help="стороны карт для замера стоимости хода")
+    arg_parser.add_argument('--steps', type=int, default=200)
+    arg_parser.add_argument('--gen-cells', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+                            help="размеры карт в клетках для замера генератора")
+    arg_parser.add_argument('--save-sizes', type=int, nargs='+', default=[1000, 3000],
+                            help="стороны карт для замера сохранения и загрузки")
+    arg_parser.add_argument('--path-sizes', type=int, nargs='+', default=[100, 1000],
+                            help="стороны карт для замера поиска пути")
+    arg_parser.add_argument('--queries', type=int, default=100, help="запросов A* и изменений клеток на карту")
+    arg_parser.add_argument('--entities', type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    use_numpy = np is not None and not args.lists
+    print(f"Карта {args.size}x{args.size}, {'numpy' if use_numpy else 'списки'}, {args.moves} позиций")
+    print(f"{'радиус':>6} {'режим':<8} {'p50, мс':>9} {'p90, мс':>9} {'зал, мс':>9} {'пропуски':>9}")
+    for radius in args.radius:
+        for fov_mode in FOV_MODES:
+            p50, p90 = time_fov(radius, fov_mode, use_numpy, args.size, args.moves, args.seed)
+            open_ms, gaps = open_fov(radius, fov_mode, use_numpy)
+            print(f"{radius:>6} {fov_mode:<8} {p50:>9.3f} {p90:>9.3f} {open_ms:>9.3f} {gaps:>9}")
+
+    print(f"\nСтоимость хода, мс (радиус {args.radius[0]}, {args.steps} шагов)")
+    print(f"{'карта':>11} {'режим':<8} {'полный':>9} {'инкрем.':>9}")
+    for size in args.move_sizes:
+        for fov_mode in FOV_MODES:
+            full, incremental = (time_moves(size, args.radius[0], fov_mode, use_numpy, incremental_fov,
+                                            args.steps, args.seed) for incremental_fov in (False, True))
+            print(f"{f'{size}x{size}':>11} {fov_mode:<8} {full:>9.3f} {incremental:>9.3f}")
+
+    print("\nСохранение и загрузка")
+    print(f"{'карта':>11} {'запись, мс':>11} {'чтение, мс':>11} {'файл, КБ':>9}")
+    for size in args.save_sizes:
+        saved, loaded, file_size = time_save(size, use_numpy, args.seed)
+        print(f"{f'{size}x{size}':>11} {saved * 1000:>11.1f} {loaded * 1000:>11.1f} {file_size / 1024:>9.0f}")
+
+    print(f"\nПоиск пути ({args.queries} запросов, {args.entities} существ)")
+    print(f"{'карта':>11} {'A*, мс':>9} {'Дейкстра, мс':>13} {'правка, мс':>11} {'шагов/с':>10}")
+    for size in args.path_sizes:
+        astar_time, full_time, update_time, entity_rate = time_paths(size, use_numpy, args.queries,
+                                                                     args.entities, args.seed)
+        print(f"{f'{size}x{size}':>11} {astar_time * 1000:>9.2f} {full_time * 1000:>13.1f} "
+              f"{update_time * 1000:>11.3f} {entity_rate:>10.0f}")
+
+    if np is None:
+        return
+    print("\nГенератор карт")
+    print(f"{'карта':>11} {'время, с':>9} {'Мклеток/с':>10} {'пол':>6}")
+    for cells in args.gen_cells:
+        side, elapsed, floor = time_mapgen(cells, args.seed)
+        print(f"{f'{side}x{side}':>11} {elapsed:>9.3f} {side * side / elapsed / 1e6:>10.2f} {floor:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import argparse
+import contextlib
+import glob
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import zlib
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from acmp_categories import extract_categories
+from acmp_parse import parse_html
+from acmp_pipeline import (FETCH_STAGE, LISTING_STAGE, STAGE_LABELS, build_pipeline, extract_alternative_condition,
+                           fetch_task_record, parse_condition_text)
+from acmp_sinks import CsvSink
+
+TASKS_PER_PAGE = 50
+
+WORDS = ['задача', 'число', 'сумма', 'строка', 'граф', 'вершина', 'дерево', 'массив', 'найти', 'точка',
+         'отрезок', 'перестановка', 'алгоритм', 'рекурсия', 'требуется', 'вывести', 'каждый', 'если',
+         'дано', 'значение', 'целое', 'между', 'количество', 'минимальный', 'ответ', 'условие']
+
+
+def keyword_scan_condition_text(text):
+    lines = text.split('\n')
+    current_section = 'condition'
+    sections = {'condition': [], 'input': [], 'output': [], 'examples': []}
+
+    input_keywords = ['входные данные', 'input', 'входной', 'input data']
+    output_keywords = ['выходные данные', 'output', 'выходной', 'output data']
+    example_keywords = ['пример', 'example', 'sample', 'тест']
+
+    for line in lines:
+        line_lower = line.lower().strip()
+
+        if any(keyword in line_lower for keyword in input_keywords):
+            current_section = 'input'
+        elif any(keyword in line_lower for keyword in output_keywords):
+            current_section = 'output'
+        elif any(keyword in line_lower for keyword in example_keywords):
+            current_section = 'examples'
+
+        if line.strip():
+            sections[current_section].append(line.strip())
+
+    return {
+        'condition_text': '\n'.join(sections['condition'])[:2000],
+        'input_format': '\n'.join(sections['input'])[:1000],
+        'output_format': '\n'.join(sections['output'])[:1000],
+        'examples': '\n'.join(sections['examples'])[:1500]
+    }
+
+
+def corpus_file_name(url):
+    query = parse_qs(urlsplit(url).query)
+    main = query.get('main', [''])[0]
+    if main == 'tasks':
+        return f"listing_{query.get('page', ['1'])[0]}.html"
+    if main == 'task':
+        return f"task_{query.get('id_task', [''])[0]}.html"
+    return None
+
+
+def record_corpus(cache_path, corpus_dir):
+    os.makedirs(corpus_dir, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    count = 0
+    try:
+        for url, body in conn.execute("SELECT url, body FROM responses"):
+            name = corpus_file_name(url)
+            if name:
+                with open(os.path.join(corpus_dir, name), 'wb') as f:
+                    f.write(zlib.decompress(body))
+                count += 1
+    finally:
+        conn.close()
+    return count
+
+
+def sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length)).capitalize() + '.'
+
+
+def task_page(complexity, statement, input_text, output_text, example_input, example_output):
+    return (f"<html><body><table class='main'><tr><td class='text'>"
+            f"<p>Время: 1 сек. Память: 16 Мб Сложность: {complexity}%</p>{statement}"
+            f"<h2>Входные данные</h2><p>{input_text}</p>"
+            f"<h2>Выходные данные</h2><p>{output_text}</p>"
+            f"<h2>Пример</h2><table><tr><td>INPUT.TXT</td><td>OUTPUT.TXT</td></tr>"
+            f"<tr><td>{example_input}</td><td>{example_output}</td></tr></table>"
+            f"</td></tr></table></body></html>")
+
+
+def check_sections(parser=None):
+    html = task_page(10, "<p>Найдите сумму двух чисел.</p>", "Два целых числа.", "Одно число.", "4 96", 100)
+    sections = parse_condition_text(parse_html(html, parser).main_text())
+    expected = {
+        'input_format': 'Входные данные\nДва целых числа.',
+        'output_format': 'Выходные данные\nОдно число.',
+        'examples': 'Пример\nINPUT.TXT\nOUTPUT.TXT\n4 96\n100'
+    }
+    return [field for field, value in expected.items() if sections[field] != value]
+
+
+def synthetic_corpus(corpus_dir, task_count, seed=1):
+    rng = random.Random(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    page_count = (task_count + TASKS_PER_PAGE - 1) // TASKS_PER_PAGE
+
+    for page in range(1, page_count + 1):
+        first = (page - 1) * TASKS_PER_PAGE + 1
+        last = min(task_count, page * TASKS_PER_PAGE)
+        rows = ''.join(
+            f"<tr><td>{task_id}</td><td><a href='?main=task&id_task={task_id}'>{sentence(rng, 3)}</a></td>"
+            f"<td>{sentence(rng, 6)}</td><td>{rng.randint(1, 9)}</td><td>{rng.randint(1, 99)}%</td>"
+            f"<td>{rng.randint(0, 5000)}</td><td>{rng.randint(0, 100)}</td></tr>"
+            for task_id in range(first, last + 1)
+        )
+        page_links = ' '.join(f"<a href='?main=tasks&page={number}'>{number}</a>" for number in range(1, page_count + 1))
+        next_link = f"<a href='?main=tasks&page={page + 1}'>Следующая</a>" if page < page_count else ''
+        html = (f"<html><body><table class='menu'><tr><td>acmp.ru</td></tr></table>"
+                f"<table><tr><th>ID</th><th>Название</th><th>Тема</th><th>Источник</th><th>Сложность</th>"
+                f"<th>Решили</th><th>Рейтинг</th></tr>{rows}</table>{page_links} {next_link}</body></html>")
+        with open(os.path.join(corpus_dir, f'listing_{page}.html'), 'wb') as f:
+            f.write(html.encode('windows-1251'))
+
+    for task_id in range(1, task_count + 1):
+        statement = ''.join(f"<p>{sentence(rng, rng.randint(15, 40))}</p>" for _ in range(rng.randint(2, 6)))
+        html = task_page(rng.randint(1, 99), statement, sentence(rng, 20), sentence(rng, 12),
+                         f"{rng.randint(1, 100)} {rng.randint(1, 100)}", rng.randint(1, 200))
+        with open(os.path.join(corpus_dir, f'task_{task_id}.html'), 'wb') as f:
+            f.write(html.encode('windows-1251'))
+
+    return page_count + task_count
+
+
+class FixtureAdapter(BaseAdapter):
+    def __init__(self, corpus_dir, latency=0.0):
+        super().__init__()
+        self.corpus_dir = corpus_dir
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=windows-1251'})
+
+        name = corpus_file_name(request.url)
+        path = os.path.join(self.corpus_dir, name) if name else None
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                response._content = f.read()
+            response.status_code = 200
+        else:
+            response._content = b''
+            response.status_code = 404
+        return response
+
+    def close(self):
+        pass
+
+
+def fixture_session(corpus_dir, latency=0.0):
+    session = requests.Session()
+    adapter = FixtureAdapter(corpus_dir, latency)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0, 0.0, 0.0
+    pick = lambda p: samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+    return pick(50), pick(90), pick(99)
+
+
+def time_calls(func, inputs):
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_functions(corpus_dir, parser=None):
+    task_pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, 'task_*.html'))):
+        with open(path, 'rb') as f:
+            task_id = os.path.basename(path)[len('task_'):-len('.html')]
+            task_pages.append((task_id, f.read().decode('windows-1251', errors='replace')))
+    if not task_pages:
+        return {}
+
+    docs = [parse_html(html, parser) for _, html in task_pages]
+    texts = [doc.main_text() or '' for doc in docs]
+    long_texts = ['\n'.join([text] * 20) for text in texts]
+    tasks = [{'task_id': task_id, 'name': '', 'description': '', 'complexity': '', 'solved_count': '',
+              'fingerprint': ''} for task_id, _ in task_pages]
+    session = fixture_session(corpus_dir)
+
+    return {
+        'fetch_task_record': time_calls(lambda task: fetch_task_record(task, session, parser), tasks),
+        'parse_condition_text': time_calls(parse_condition_text, texts),
+        'parse_condition_text (старый)': time_calls(keyword_scan_condition_text, texts),
+        'parse_condition_text x20': time_calls(parse_condition_text, long_texts),
+        'parse_condition_text x20 (старый)': time_calls(keyword_scan_condition_text, long_texts),
+        'extract_alternative_condition': time_calls(extract_alternative_condition, docs),
+        'extract_categories': time_calls(lambda text: extract_categories('', '', text), texts)
+    }
+
+
+def bench_pipeline(corpus_dir, parser=None, max_workers=4, parse_workers=None, latency=0.0):
+    workdir = tempfile.mkdtemp(prefix='acmp_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        pipeline = build_pipeline([CsvSink()], max_tasks=None, max_workers=max_workers, per_host=max_workers,
+                                  rate=1e9, cache_path=None, checkpoint_path=None, parser=parser,
+                                  parse_workers=parse_workers, session=fixture_session(corpus_dir, latency))
+        pipeline.run()
+    finally:
+        os.chdir(cwd)
+    return pipeline
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Офлайн-бенчмарк скрапера acmp.ru")
+    arg_parser.add_argument('--corpus', help="каталог со страницами listing_N.html и task_N.html")
+    arg_parser.add_argument('--record-from', help="выгрузить корпус из кэша ответов (acmp_cache.sqlite)")
+    arg_parser.add_argument('--synthetic', type=int, default=0, help="сгенерировать корпус из N задач")
+    arg_parser.add_argument('--parser', default=None)
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--parse-workers', type=int, default=None)
+    arg_parser.add_argument('--latency', type=float, default=0.0, help="искусственная задержка ответа, с")
+    args = arg_parser.parse_args()
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix='acmp_corpus_')
+    if args.record_from:
+        print(f"Записано страниц: {record_corpus(args.record_from, corpus_dir)}")
+    if args.synthetic:
+        print(f"Сгенерировано страниц: {synthetic_corpus(corpus_dir, args.synthetic)}")
+    if not glob.glob(os.path.join(corpus_dir, 'listing_*.html')):
+        print(f"В {corpus_dir} нет страниц корпуса")
+        return
+
+    wrong_fields = check_sections(args.parser)
+    if wrong_fields:
+        print(f"Разделы страницы с таблицей примеров разобраны неверно: {', '.join(wrong_fields)}")
+    else:
+        print("Разделы страницы с таблицей примеров разобраны верно")
+
+    print(f"\nКорпус: {corpus_dir}")
+    print(f"{'функция':<36} {'вызовов':>8} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9}")
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        function_samples = bench_functions(corpus_dir, args.parser)
+        pipeline = bench_pipeline(corpus_dir, args.parser, args.workers, args.parse_workers, args.latency)
+
+    for name, samples in function_samples.items():
+        p50, p90, p99 = percentiles(samples)
+        print(f"{name:<36} {len(samples):>8} {p50:>9.3f} {p90:>9.3f} {p99:>9.3f}")
+
+    pages = pipeline.metrics.count(LISTING_STAGE) + pipeline.metrics.count(FETCH_STAGE)
+
+    print(f"\nПолный прогон: {pipeline.task_counter} задач, {pages} страниц за {pipeline.wall_time:.2f} с "
+          f"({pages / pipeline.wall_time:.1f} стр/с)")
+    print(f"{'этап':<14} {'шт.':>8} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9}")
+    for stage, label in STAGE_LABELS.items():
+        p50, p90, p99 = (pipeline.metrics.quantile(stage, q) * 1000 for q in (0.5, 0.9, 0.99))
+        print(f"{label:<14} {pipeline.metrics.count(stage):>8} {p50:>9.3f} {p90:>9.3f} {p99:>9.3f}")
+
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"Пиковый RSS: {rss:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
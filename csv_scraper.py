@@ -0,0 +1,41 @@
+import csv
+import os
+
+from acmp_pipeline import run_pipeline
+from acmp_shards import prepare_shard
+from acmp_sinks import CsvSink, SqliteSink
+
+def scrape_acmp_tasks(max_tasks=50, sqlite_path=None, shard=None, **options):
+    directory = prepare_shard(shard, options) if shard else '.'
+    sinks = [CsvSink(directory=directory)]
+    if sqlite_path:
+        sinks.append(SqliteSink(os.path.join(directory, sqlite_path)))
+
+    task_counter, categories_map = run_pipeline(sinks, max_tasks=max_tasks, **options)
+
+    print("Данные успешно сохранены в CSV файлы!")
+    print(f"Обработано задач: {task_counter}")
+    print(f"Обработано категорий: {len(categories_map)}")
+
+def print_sample_conditions():
+    try:
+        with open('task_conditions.csv', 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            print("\n" + "="*50)
+            print("ПРИМЕРЫ УСЛОВИЙ ЗАДАЧ (первые 5):")
+            print("="*50)
+            
+            for i, row in enumerate(reader):
+                if i >= 5:
+                    break
+                
+                print(f"\n--- Задача ID: {row['task_id']} ---")
+                print(f"Условие: {row['condition_text'][:300]}...")
+                print("-" * 50)
+                
+    except FileNotFoundError:
+        print("Файл с условиями не найден. Сначала запустите скрапинг.")
+
+if __name__ == "__main__":
+    scrape_acmp_tasks()
+    print_sample_conditions()
@@ -1,18 +1,61 @@
 import os
 import random
 import math
+import shutil
 import time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from rogalik_bits import BitMask
+from rogalik_fov import ray_fov, shadowcast
+from rogalik_mapgen import generate_cave, remove_unreachable
+from rogalik_path import PathGrid
+from rogalik_render import TerminalRenderer
+from rogalik_world import CHUNK_SIZE, ChunkedWorld
+
+FOV_MODES = ('ray', 'shadow')
+ACTIONS = {'w': (0, -1), 's': (0, 1), 'a': (-1, 0), 'd': (1, 0)}
+QUIT = 'q'
+EXPLORE = 'e'
+# chunks around the player's chunk covered by pathfinding in the chunked world
+PATH_CHUNKS = 2
+HEADER = ["Управление: WASD - движение, E - автоисследование, Q - выход", "Символы: @ - вы, # - стены"]
+
 class Roguelike:
-    def __init__(self):
-        self.WIDTH = 40
-        self.HEIGHT = 20
-        self.FOV_RADIUS = 5
+    def __init__(self, width=40, height=20, fov_radius=5, use_numpy=None, fov_mode='ray', incremental_fov=True,
+                 view_width=None, view_height=None, seed=None, chunked=False, chunk_size=CHUNK_SIZE,
+                 cache_chunks=64, world_path=None, generate=True):
+        if fov_mode not in FOV_MODES:
+            raise ValueError(f"Неизвестный режим обзора: {fov_mode}")
+        self.WIDTH = width
+        self.HEIGHT = height
+        self.FOV_RADIUS = fov_radius
+        self.fov_mode = fov_mode
+        self.incremental_fov = incremental_fov
+        self.fov_box = None
+        self.view_width = view_width
+        self.view_height = view_height
+        self.renderer = TerminalRenderer()
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.turn = 0
+        self.use_numpy = np is not None and use_numpy is not False
+        self.world = None
+        if chunked:
+            if not self.use_numpy:
+                raise ValueError("Бесконечный мир требует numpy")
+            self.world = ChunkedWorld(seed, chunk_size, cache_chunks, world_path)
         
         self.EMPTY = ' '
         self.WALL = '#'
         self.FLOOR = '.'
         self.PLAYER = '@'
+        if self.use_numpy:
+            # in array mode tiles are uint8 codes of the same characters
+            self.EMPTY, self.WALL, self.FLOOR, self.PLAYER = (ord(c) for c in ' #.@')
         
         self.map = []
         self.visible = []
@@ -22,13 +65,26 @@ class Roguelike:
         self.gameRunning = True
         
         self.initialize_arrays()
-        self.generate_map()
-        self.update_fov()
+        if generate:
+            self.generate_map()
+            self.update_fov()
     
     def initialize_arrays(self):
+        self.fov_box = None
+        self.path_grid = None
+        if self.world:
+            self.map = None
+            self.visible = np.zeros((0, 0), dtype=bool)
+            self.explored = None
+            return
+        if self.use_numpy:
+            self.map = np.full((self.HEIGHT, self.WIDTH), self.EMPTY, dtype=np.uint8)
+            self.visible = np.zeros((self.HEIGHT, self.WIDTH), dtype=bool)
+            self.explored = np.zeros((self.HEIGHT, self.WIDTH), dtype=bool)
+            return
         self.map = [[self.EMPTY for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
-        self.visible = [[False for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
-        self.explored = [[False for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
+        self.visible = BitMask(self.WIDTH, self.HEIGHT)
+        self.explored = BitMask(self.WIDTH, self.HEIGHT)
     
     def cast_ray(self, x1, y1, x2, y2):
         dx = abs(x2 - x1)
@@ -41,11 +97,16 @@ class Roguelike:
         
         while True:
             if 0 <= x < self.WIDTH and 0 <= y < self.HEIGHT:
-                self.visible[y][x] = True
-                self.explored[y][x] = True
-                
-                if self.map[y][x] == self.WALL:
-                    break
+                if self.use_numpy:
+                    self.visible[y, x] = True
+                    if self.map[y, x] == self.WALL:
+                        break
+                else:
+                    self.visible.set(x, y)
+                    self.explored.set(x, y)
+                    
+                    if self.map[y][x] == self.WALL:
+                        break
             
             if x == x2 and y == y2:
                 break
@@ -58,34 +119,115 @@ class Roguelike:
                 err += dx
                 y += sy
     
+    def view_box(self):
+        r = self.FOV_RADIUS
+        return (max(0, self.playerX - r), max(0, self.playerY - r),
+                min(self.WIDTH, self.playerX + r + 1), min(self.HEIGHT, self.playerY + r + 1))
+    
+    def clear_visible(self):
+        if self.incremental_fov and self.fov_box:
+            x0, y0, x1, y1 = self.fov_box
+            if self.use_numpy:
+                self.visible[y0:y1, x0:x1] = False
+            else:
+                for y in range(y0, y1):
+                    self.visible.clear_span(y, x0, x1)
+        elif self.use_numpy:
+            self.visible[:] = False
+        else:
+            self.visible.clear_all()
+    
+    def shadowcast_fov(self):
+        r = self.FOV_RADIUS
+        x0, y0, x1, y1 = self.view_box()
+        
+        if self.use_numpy:
+            walls = (self.map[y0:y1, x0:x1] == self.WALL).tolist()
+        else:
+            walls = [[tile == self.WALL for tile in row[x0:x1]] for row in self.map[y0:y1]]
+        seen = shadowcast(walls, self.playerX - x0, self.playerY - y0, r)
+        
+        if self.use_numpy:
+            xs, ys = np.array(seen).T
+            self.visible[ys + y0, xs + x0] = True
+        else:
+            for x, y in seen:
+                self.visible.set(x + x0, y + y0)
+                self.explored.set(x + x0, y + y0)
+    
+    def world_fov(self):
+        r = self.FOV_RADIUS
+        x0, y0 = self.playerX - r, self.playerY - r
+        walls = self.world.walls(x0, y0, x0 + 2 * r + 1, y0 + 2 * r + 1).tolist()
+        seen = (shadowcast if self.fov_mode == 'shadow' else ray_fov)(walls, r, r, r)
+        
+        self.visible = np.zeros((2 * r + 1, 2 * r + 1), dtype=bool)
+        xs, ys = np.array(seen).T
+        self.visible[ys, xs] = True
+        self.fov_box = (x0, y0, x0 + 2 * r + 1, y0 + 2 * r + 1)
+        self.world.mark_explored(x0, y0, self.visible)
+    
     def update_fov(self):
-        for y in range(self.HEIGHT):
-            for x in range(self.WIDTH):
-                self.visible[y][x] = False
+        if self.world:
+            self.world_fov()
+            return
+        self.clear_visible()
         
-        self.visible[self.playerY][self.playerX] = True
-        self.explored[self.playerY][self.playerX] = True
+        if self.use_numpy:
+            self.visible[self.playerY, self.playerX] = True
+        else:
+            self.visible.set(self.playerX, self.playerY)
+            self.explored.set(self.playerX, self.playerY)
         
-        for angle in range(0, 360, 5):
-            rad = angle * math.pi / 180.0
-            endX = self.playerX + int(self.FOV_RADIUS * math.cos(rad))
-            endY = self.playerY + int(self.FOV_RADIUS * math.sin(rad))
-            self.cast_ray(self.playerX, self.playerY, endX, endY)
+        if self.fov_mode == 'shadow':
+            self.shadowcast_fov()
+        else:
+            for angle in range(0, 360, 5):
+                rad = angle * math.pi / 180.0
+                endX = self.playerX + int(self.FOV_RADIUS * math.cos(rad))
+                endY = self.playerY + int(self.FOV_RADIUS * math.sin(rad))
+                self.cast_ray(self.playerX, self.playerY, endX, endY)
+        
+        self.fov_box = self.view_box()
+        if self.use_numpy:
+            if self.incremental_fov:
+                x0, y0, x1, y1 = self.fov_box
+                self.explored[y0:y1, x0:x1] |= self.visible[y0:y1, x0:x1]
+            else:
+                self.explored |= self.visible
     
     def generate_map(self):
+        if self.world:
+            # every chunk has floor along its middle row and column
+            self.playerX = self.playerY = self.world.chunk_size // 2
+            return
+        
+        if self.use_numpy:
+            walls, self.playerX, self.playerY = generate_cave(self.WIDTH, self.HEIGHT, self.seed,
+                                                              self.playerX, self.playerY)
+            self.map[:] = np.where(walls, self.WALL, self.FLOOR)
+            self.map[self.playerY, self.playerX] = self.PLAYER
+            return
+        
         for y in range(self.HEIGHT):
             for x in range(self.WIDTH):
                 if x == 0 or y == 0 or x == self.WIDTH-1 or y == self.HEIGHT-1:
                     self.map[y][x] = self.WALL
-                elif random.randint(0, 99) < 30:
+                elif self.random.randint(0, 99) < 30:
                     self.map[y][x] = self.WALL
                 else:
                     self.map[y][x] = self.FLOOR
         
         self.map[self.playerY][self.playerX] = self.PLAYER
         self.clear_area_around_player()
+        remove_unreachable(self.map, self.WALL, self.playerX, self.playerY)
     
     def clear_area_around_player(self):
+        if self.use_numpy:
+            self.map[max(0, self.playerY - 1):self.playerY + 2, max(0, self.playerX - 1):self.playerX + 2] = self.FLOOR
+            self.map[self.playerY, self.playerX] = self.PLAYER
+            return
+        
         for dy in range(-1, 2):
             for dx in range(-1, 2):
                 newY = self.playerY + dy
@@ -94,29 +236,62 @@ class Roguelike:
                     self.map[newY][newX] = self.FLOOR
         self.map[self.playerY][self.playerX] = self.PLAYER
     
-    def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def viewport(self):
+        columns, lines = shutil.get_terminal_size((80, 24))
+        if self.world:
+            view_width = self.view_width or columns
+            view_height = self.view_height or lines - len(HEADER) - 1
+            return self.playerX - view_width // 2, self.playerY - view_height // 2, view_width, view_height
+        
+        view_width = min(self.WIDTH, self.view_width or columns)
+        view_height = min(self.HEIGHT, self.view_height or lines - len(HEADER) - 1)
+        x = min(max(0, self.playerX - view_width // 2), self.WIDTH - view_width)
+        y = min(max(0, self.playerY - view_height // 2), self.HEIGHT - view_height)
+        return x, y, view_width, view_height
     
-    def render(self):
-        self.clear_screen()
+    def frame_lines(self):
+        x0, y0, view_width, view_height = self.viewport()
+        x1, y1 = x0 + view_width, y0 + view_height
         
-        print("Управление: WASD - движение, Q - выход")
-        print("Символы: @ - вы, # - стены")
+        if self.world:
+            walls = self.world.walls(x0, y0, x1, y1)
+            shown = self.world.explored(x0, y0, x1, y1)
+            fx0, fy0, fx1, fy1 = self.fov_box
+            vx0, vy0, vx1, vy1 = max(fx0, x0), max(fy0, y0), min(fx1, x1), min(fy1, y1)
+            if vx0 < vx1 and vy0 < vy1:
+                shown[vy0 - y0:vy1 - y0, vx0 - x0:vx1 - x0] |= self.visible[vy0 - fy0:vy1 - fy0, vx0 - fx0:vx1 - fx0]
+            frame = np.where(shown, np.where(walls, ord('#'), ord('.')), ord(' ')).astype(np.uint8)
+            frame[self.playerY - y0, self.playerX - x0] = ord('@')
+            return [row.tobytes().decode('ascii') for row in frame]
         
-        for y in range(self.HEIGHT):
-            for x in range(self.WIDTH):
-                if self.visible[y][x]:
-                    print(self.map[y][x], end='')
-                elif self.explored[y][x]:
-                    if self.map[y][x] == self.WALL:
-                        print('#', end='')
-                    else:
-                        print('.', end='')
+        if self.use_numpy:
+            tiles = self.map[y0:y1, x0:x1]
+            visible = self.visible[y0:y1, x0:x1]
+            explored = self.explored[y0:y1, x0:x1]
+            frame = np.full(tiles.shape, ord(' '), dtype=np.uint8)
+            frame[explored] = np.where(tiles[explored] == self.WALL, ord('#'), ord('.'))
+            frame[visible] = tiles[visible]
+            return [row.tobytes().decode('ascii') for row in frame]
+        
+        lines = []
+        for y in range(y0, y1):
+            line = []
+            for x in range(x0, x1):
+                if self.visible.test(x, y):
+                    line.append(self.map[y][x])
+                elif self.explored.test(x, y):
+                    line.append('#' if self.map[y][x] == self.WALL else '.')
                 else:
-                    print(' ', end='')
-            print()
+                    line.append(' ')
+            lines.append(''.join(line))
+        return lines
+    
+    def render(self):
+        self.renderer.draw(HEADER + self.frame_lines())
     
     def is_valid_move(self, x, y):
+        if self.world:
+            return not self.world.is_wall(x, y)
         return 0 <= x < self.WIDTH and 0 <= y < self.HEIGHT and self.map[y][x] != self.WALL
     
     def move_player(self, dx, dy):
@@ -124,11 +299,104 @@ class Roguelike:
         newY = self.playerY + dy
         
         if self.is_valid_move(newX, newY):
-            self.map[self.playerY][self.playerX] = self.FLOOR
+            if not self.world:
+                self.map[self.playerY][self.playerX] = self.FLOOR
+                self.map[newY][newX] = self.PLAYER
             self.playerX = newX
             self.playerY = newY
-            self.map[self.playerY][self.playerX] = self.PLAYER
             self.update_fov()
+            return True
+        return False
+    
+    def set_wall(self, x, y, wall=True):
+        if wall and (x, y) == (self.playerX, self.playerY):
+            return False
+        if self.world:
+            self.world.set_wall(x, y, wall)
+        elif 0 <= x < self.WIDTH and 0 <= y < self.HEIGHT:
+            self.map[y][x] = self.WALL if wall else self.FLOOR
+        else:
+            return False
+        if self.path_grid and self.path_grid.contains(x, y):
+            self.path_grid.set_blocked(x, y, wall)
+        self.update_fov()
+        return True
+    
+    def paths(self):
+        if self.world:
+            size = self.world.chunk_size
+            x0 = (self.playerX // size - PATH_CHUNKS) * size
+            y0 = (self.playerY // size - PATH_CHUNKS) * size
+            if not self.path_grid or (self.path_grid.x0, self.path_grid.y0) != (x0, y0):
+                side = (2 * PATH_CHUNKS + 1) * size
+                walls = self.world.walls(x0, y0, x0 + side, y0 + side)
+                self.path_grid = PathGrid(walls.tobytes(), side, x0, y0)
+        elif not self.path_grid:
+            if self.use_numpy:
+                walls = (self.map == self.WALL).tobytes()
+            else:
+                walls = bytearray(tile == self.WALL for row in self.map for tile in row)
+            self.path_grid = PathGrid(walls, self.WIDTH)
+        return self.path_grid
+    
+    def find_path(self, x, y):
+        return self.paths().path((self.playerX, self.playerY), (x, y))
+    
+    def explore_path(self):
+        grid = self.paths()
+        if self.world:
+            explored = self.world.explored(grid.x0, grid.y0, grid.x0 + grid.width, grid.y0 + grid.height).tobytes()
+        elif self.use_numpy:
+            explored = self.explored.tobytes()
+        else:
+            explored = self.explored
+        return grid.nearest((self.playerX, self.playerY), explored)
+    
+    def auto_explore(self):
+        path = self.explore_path()
+        if not path:
+            return False
+        x, y = path[0]
+        return self.move_player(x - self.playerX, y - self.playerY)
+    
+    def is_visible(self, x, y):
+        if self.world:
+            x0, y0, x1, y1 = self.fov_box
+            return x0 <= x < x1 and y0 <= y < y1 and bool(self.visible[y - y0, x - x0])
+        if self.use_numpy:
+            return bool(self.visible[y, x])
+        return self.visible.test(x, y)
+    
+    def explored_count(self):
+        if self.world:
+            return self.world.explored_count()
+        if self.use_numpy:
+            return int(self.explored.sum())
+        return self.explored.count()
+    
+    def close(self):
+        if self.world:
+            self.world.close()
+    
+    def state(self, moved=False):
+        return {
+            'x': self.playerX,
+            'y': self.playerY,
+            'turn': self.turn,
+            'moved': moved,
+            'running': self.gameRunning
+        }
+    
+    def step(self, action):
+        moved = False
+        if action == QUIT:
+            self.gameRunning = False
+        elif action == EXPLORE:
+            moved = self.auto_explore()
+        elif action in ACTIONS:
+            moved = self.move_player(*ACTIONS[action])
+        self.turn += 1
+        return self.state(moved)
     
     def getch(self):
         if os.name == 'nt':
@@ -149,29 +417,23 @@ class Roguelike:
     
     def process_input(self):
         try:
-            input_char = self.getch().lower()
-            
-            if input_char == 'w':
-                self.move_player(0, -1)
-            elif input_char == 's':
-                self.move_player(0, 1)
-            elif input_char == 'a':
-                self.move_player(-1, 0)
-            elif input_char == 'd':
-                self.move_player(1, 0)
-            elif input_char == 'q':
-                self.gameRunning = False
-                return True
+            self.step(self.getch().lower())
         except:
             pass
-        return False
+        return not self.gameRunning
     
     def run(self):
-        while self.gameRunning:
-            self.render()
-            if self.process_input():
-                break
-            time.sleep(0.05)
+        if os.name == 'nt':
+            os.system('')
+        try:
+            while self.gameRunning:
+                self.render()
+                if self.process_input():
+                    break
+                time.sleep(0.05)
+        finally:
+            self.renderer.close()
+            self.close()
         print("Спасибо за игру!")
 
 if __name__ == "__main__":
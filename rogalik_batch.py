@@ -0,0 +1,94 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rogalik import ACTIONS, Roguelike
+
+MOVES = list(ACTIONS)
+
+
+def random_policy(game, state, rng):
+    return rng.choice(MOVES)
+
+
+def simulate_game(seed, steps=1000, policy=random_policy, **options):
+    start = time.perf_counter()
+    game = Roguelike(seed=seed, **options)
+    rng = random.Random(seed)
+
+    state = game.state()
+    moves = 0
+    for _ in range(steps):
+        state = game.step(policy(game, state, rng))
+        moves += state['moved']
+        if not state['running']:
+            break
+
+    explored = game.explored_count()
+    game.close()
+    return {
+        'seed': seed,
+        'steps': state['turn'],
+        'moves': moves,
+        'explored': explored,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def simulate_chunk(seeds, steps, options):
+    return [simulate_game(seed, steps, **options) for seed in seeds]
+
+
+def run_batch(games, steps=1000, processes=None, first_seed=0, **options):
+    processes = processes or os.cpu_count()
+    seeds = list(range(first_seed, first_seed + games))
+    chunks = [seeds[i::processes] for i in range(processes) if seeds[i::processes]]
+
+    start = time.perf_counter()
+    if processes == 1:
+        results = simulate_chunk(seeds, steps, options)
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = [result for chunk in executor.map(simulate_chunk, chunks, [steps] * len(chunks),
+                                                        [options] * len(chunks))
+                       for result in chunk]
+    wall_time = time.perf_counter() - start
+
+    results.sort(key=lambda result: result['seed'])
+    total_steps = sum(result['steps'] for result in results)
+    busy_time = sum(result['seconds'] for result in results)
+    return {
+        'games': results,
+        'processes': processes,
+        'steps': total_steps,
+        'wall_time': wall_time,
+        'steps_per_second': total_steps / wall_time if wall_time else 0.0,
+        'steps_per_core_second': total_steps / busy_time if busy_time else 0.0
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Пакетная симуляция игр Roguelike без терминала")
+    arg_parser.add_argument('--games', type=int, default=100)
+    arg_parser.add_argument('--steps', type=int, default=1000)
+    arg_parser.add_argument('--processes', type=int, default=None)
+    arg_parser.add_argument('--seed', type=int, default=0, help="seed первой игры, остальные идут подряд")
+    arg_parser.add_argument('--width', type=int, default=40)
+    arg_parser.add_argument('--height', type=int, default=20)
+    arg_parser.add_argument('--fov-mode', default='ray')
+    args = arg_parser.parse_args()
+
+    report = run_batch(args.games, args.steps, args.processes, args.seed, width=args.width, height=args.height,
+                       fov_mode=args.fov_mode)
+
+    explored = sum(game['explored'] for game in report['games']) / len(report['games'])
+    print(f"Игр: {len(report['games'])}, шагов: {report['steps']}, процессов: {report['processes']}")
+    print(f"Время: {report['wall_time']:.2f} с, {report['steps_per_second']:.0f} шагов/с, "
+          f"{report['steps_per_core_second']:.0f} шагов/с на ядро")
+    print(f"В среднем исследовано клеток: {explored:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+class BitMask:
+    def __init__(self, width, height, data=None):
+        self.width = width
+        self.height = height
+        size = (width * height + 7) // 8
+        self.data = bytearray(data) if data is not None else bytearray(size)
+        if len(self.data) != size:
+            raise ValueError(f"Ожидалось {size} байт маски, получено {len(self.data)}")
+
+    def set(self, x, y):
+        i = y * self.width + x
+        self.data[i >> 3] |= 1 << (i & 7)
+
+    def test(self, x, y):
+        i = y * self.width + x
+        return self.data[i >> 3] >> (i & 7) & 1 == 1
+
+    def clear(self, x, y):
+        i = y * self.width + x
+        self.data[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def clear_all(self):
+        self.data[:] = bytes(len(self.data))
+
+    def clear_span(self, y, x0, x1):
+        start, end = y * self.width + x0, y * self.width + x1
+        while start < end and start & 7:
+            self.data[start >> 3] &= ~(1 << (start & 7)) & 0xFF
+            start += 1
+        while end > start and end & 7:
+            end -= 1
+            self.data[end >> 3] &= ~(1 << (end & 7)) & 0xFF
+        if start < end:
+            self.data[start >> 3:end >> 3] = bytes((end - start) >> 3)
+
+    def __getitem__(self, i):
+        return self.data[i >> 3] >> (i & 7) & 1
+
+    def count(self):
+        return int.from_bytes(self.data, 'little').bit_count()
+
+    def to_bytes(self):
+        return bytes(self.data)
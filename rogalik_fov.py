@@ -0,0 +1,93 @@
+import math
+
+# symmetric shadowcasting: https://www.albertford.com/shadowcasting/
+# slopes are kept as (numerator, denominator) pairs so rounding is exact
+
+# (x per col, x per depth, y per col, y per depth) for north, east, south and west
+QUADRANTS = [(1, 0, 0, -1), (0, 1, 1, 0), (1, 0, 0, 1), (0, -1, 1, 0)]
+
+
+def round_ties_up(depth, slope):
+    num, den = slope
+    return (2 * depth * num + den) // (2 * den)
+
+
+def round_ties_down(depth, slope):
+    num, den = slope
+    return -((den - 2 * depth * num) // (2 * den))
+
+
+def shadowcast(walls, x, y, radius):
+    height = len(walls)
+    width = len(walls[0]) if height else 0
+    radius_sq = radius * radius + radius
+    seen = [(x, y)]
+    # cells with |col| == depth lie on the edge shared by two quadrants and may be seen from both
+    diagonal = set()
+
+    for col_x, depth_x, col_y, depth_y in QUADRANTS:
+        rows = [(1, (-1, 1), (1, 1))]
+        while rows:
+            depth, start_slope, end_slope = rows.pop()
+            if depth > radius:
+                continue
+
+            prev_wall = None
+            for col in range(round_ties_up(depth, start_slope), round_ties_down(depth, end_slope) + 1):
+                tx = x + col * col_x + depth * depth_x
+                ty = y + col * col_y + depth * depth_y
+                inside = 0 <= tx < width and 0 <= ty < height
+                wall = not inside or walls[ty][tx]
+
+                if inside and depth * depth + col * col <= radius_sq and (
+                        wall or (col * start_slope[1] >= depth * start_slope[0] and
+                                 col * end_slope[1] <= depth * end_slope[0])):
+                    if col != depth and col != -depth:
+                        seen.append((tx, ty))
+                    elif (tx, ty) not in diagonal:
+                        diagonal.add((tx, ty))
+                        seen.append((tx, ty))
+
+                if prev_wall and not wall:
+                    start_slope = (2 * col - 1, 2 * depth)
+                if prev_wall is False and wall:
+                    rows.append((depth + 1, start_slope, (2 * col - 1, 2 * depth)))
+                prev_wall = wall
+
+            if prev_wall is False:
+                rows.append((depth + 1, start_slope, end_slope))
+
+    return seen
+
+
+def ray_fov(walls, x, y, radius):
+    height = len(walls)
+    width = len(walls[0]) if height else 0
+    seen = [(x, y)]
+
+    for angle in range(0, 360, 5):
+        rad = angle * math.pi / 180.0
+        end_x = x + int(radius * math.cos(rad))
+        end_y = y + int(radius * math.sin(rad))
+
+        dx, dy = abs(end_x - x), abs(end_y - y)
+        sx = 1 if x < end_x else -1
+        sy = 1 if y < end_y else -1
+        err = dx - dy
+        cx, cy = x, y
+        while True:
+            if 0 <= cx < width and 0 <= cy < height:
+                seen.append((cx, cy))
+                if walls[cy][cx]:
+                    break
+            if cx == end_x and cy == end_y:
+                break
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                cx += sx
+            if e2 < dx:
+                err += dx
+                cy += sy
+
+    return seen
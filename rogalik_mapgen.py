@@ -0,0 +1,125 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def cave_walls(width, height, seed=None, fill=0.45, smooth_steps=4, border=True):
+    rng = np.random.default_rng(seed)
+    walls = rng.random((height, width)) < fill
+
+    for _ in range(smooth_steps):
+        padded = np.pad(walls, 1, constant_values=True).view(np.uint8)
+        neighbours = np.zeros((height, width), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy != 1 or dx != 1:
+                    neighbours += padded[dy:dy + height, dx:dx + width]
+        walls = (neighbours >= 5) | (walls & (neighbours >= 4))
+
+    if border:
+        walls[[0, -1], :] = True
+        walls[:, [0, -1]] = True
+    return walls
+
+
+def floor_runs(floor):
+    height, width = floor.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = floor
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    row_index = np.searchsorted(rows, np.arange(height + 1)).tolist()
+    return rows.tolist(), starts.tolist(), ends.tolist(), row_index
+
+
+def label_runs(rows, starts, ends, row_index):
+    labels = [-1] * len(rows)
+    sizes = []
+    for first in range(len(rows)):
+        if labels[first] >= 0:
+            continue
+        label = len(sizes)
+        labels[first] = label
+        size = 0
+        queue = deque([first])
+        while queue:
+            run = queue.popleft()
+            row, start, end = rows[run], starts[run], ends[run]
+            size += end - start
+            for other_row in (row - 1, row + 1):
+                if not 0 <= other_row < len(row_index) - 1:
+                    continue
+                lo, hi = row_index[other_row], row_index[other_row + 1]
+                for other in range(bisect_right(ends, start, lo, hi), bisect_left(starts, end, lo, hi)):
+                    if labels[other] < 0:
+                        labels[other] = label
+                        queue.append(other)
+        sizes.append(size)
+    return labels, sizes
+
+
+def keep_component(walls, rows, starts, ends, labels, keep):
+    kept = np.array(labels) == keep
+    height, width = walls.shape
+    edges = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(edges, (np.array(rows)[kept], np.array(starts)[kept]), 1)
+    np.add.at(edges, (np.array(rows)[kept], np.array(ends)[kept]), -1)
+    walls[:] = np.cumsum(edges, axis=1)[:, :width] == 0
+
+
+def connect_floor(walls, start_x, start_y):
+    rows, starts, ends, row_index = floor_runs(~walls)
+    if not rows:
+        walls[start_y, start_x] = False
+        return start_x, start_y
+
+    labels, sizes = label_runs(rows, starts, ends, row_index)
+    largest = max(range(len(sizes)), key=sizes.__getitem__)
+    keep_component(walls, rows, starts, ends, labels, largest)
+
+    if walls[start_y, start_x]:
+        first = labels.index(largest)
+        return starts[first], rows[first]
+    return start_x, start_y
+
+
+def generate_cave(width, height, seed=None, start_x=1, start_y=1, fill=0.45, smooth_steps=4):
+    walls = cave_walls(width, height, seed, fill, smooth_steps)
+    walls[max(1, start_y - 1):min(height - 1, start_y + 2), max(1, start_x - 1):min(width - 1, start_x + 2)] = False
+    start_x, start_y = connect_floor(walls, start_x, start_y)
+    return walls, start_x, start_y
+
+
+def remove_unreachable(tiles, wall, start_x, start_y):
+    height, width = len(tiles), len(tiles[0])
+    reached = [[False] * width for _ in range(height)]
+    reached[start_y][start_x] = True
+    queue = deque([(start_x, start_y)])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height and not reached[ny][nx] and tiles[ny][nx] != wall:
+                reached[ny][nx] = True
+                queue.append((nx, ny))
+
+    for y in range(height):
+        for x in range(width):
+            if not reached[y][x]:
+                tiles[y][x] = wall
+
+
+def chunk_walls(size, seed, chunk_x, chunk_y, fill=0.45, smooth_steps=4):
+    walls = cave_walls(size, size, [seed, chunk_x % 2 ** 32, chunk_y % 2 ** 32], fill, smooth_steps, border=False)
+    middle = size // 2
+    walls[middle, :] = False
+    walls[:, middle] = False
+
+    rows, starts, ends, row_index = floor_runs(~walls)
+    labels, _ = label_runs(rows, starts, ends, row_index)
+    keep_component(walls, rows, starts, ends, labels, labels[row_index[middle]])
+    return walls
@@ -0,0 +1,227 @@
+from array import array
+from collections import OrderedDict, deque
+from heapq import heappop, heappush
+
+# cells are flat indexes y * width + x into a bytearray where 1 marks a wall
+UNREACHABLE = 2 ** 31 - 1
+
+
+def neighbours(cell, width, size):
+    x = cell % width
+    for other in (cell - width, cell + width, cell - 1 if x else -1, cell + 1 if x + 1 < width else -1):
+        if 0 <= other < size:
+            yield other
+
+
+def trace_path(came_from, cell):
+    path = []
+    while came_from[cell] >= 0:
+        path.append(cell)
+        cell = came_from[cell]
+    path.reverse()
+    return path
+
+
+def astar(blocked, width, start, goal):
+    if blocked[goal]:
+        return None
+    size = len(blocked)
+    goal_x, goal_y = goal % width, goal // width
+    came_from = {start: -1}
+    cost = {start: 0}
+    # equal f is broken towards the larger g so the search runs along the straight line first
+    heap = [(abs(start % width - goal_x) + abs(start // width - goal_y), 0, start)]
+
+    while heap:
+        _, g, cell = heappop(heap)
+        if cell == goal:
+            return trace_path(came_from, cell)
+        g = -g
+        if g > cost[cell]:
+            continue
+        g += 1
+        x = cell % width
+        for other in (cell - width, cell + width, cell - 1 if x else -1, cell + 1 if x + 1 < width else -1):
+            if 0 <= other < size and not blocked[other] and g < cost.get(other, UNREACHABLE):
+                cost[other] = g
+                came_from[other] = cell
+                heappush(heap, (g + abs(other % width - goal_x) + abs(other // width - goal_y), -g, other))
+    return None
+
+
+def nearest(blocked, width, start, explored):
+    size = len(blocked)
+    came_from = {start: -1}
+    queue = deque([start])
+
+    while queue:
+        cell = queue.popleft()
+        if not explored[cell]:
+            return trace_path(came_from, cell)
+        x = cell % width
+        for other in (cell - width, cell + width, cell - 1 if x else -1, cell + 1 if x + 1 < width else -1):
+            if 0 <= other < size and not blocked[other] and other not in came_from:
+                came_from[other] = cell
+                queue.append(other)
+    return None
+
+
+class DijkstraMap:
+    def __init__(self, blocked, width, goals):
+        self.blocked = blocked
+        self.width = width
+        self.goals = set(goals)
+        self.distance = None
+        self.updated = 0
+        self.recompute()
+
+    def recompute(self):
+        blocked, width, size = self.blocked, self.width, len(self.blocked)
+        distance = array('i', [UNREACHABLE]) * size
+        queue = deque()
+        for goal in self.goals:
+            if not blocked[goal]:
+                distance[goal] = 0
+                queue.append(goal)
+
+        while queue:
+            cell = queue.popleft()
+            d = distance[cell] + 1
+            x = cell % width
+            for other in (cell - width, cell + width, cell - 1 if x else -1, cell + 1 if x + 1 < width else -1):
+                if 0 <= other < size and not blocked[other] and distance[other] == UNREACHABLE:
+                    distance[other] = d
+                    queue.append(other)
+        self.distance = distance
+
+    def propagate(self, heap):
+        blocked, distance, width, size = self.blocked, self.distance, self.width, len(self.blocked)
+        while heap:
+            d, cell = heappop(heap)
+            if d > distance[cell]:
+                continue
+            self.updated += 1
+            d += 1
+            x = cell % width
+            for other in (cell - width, cell + width, cell - 1 if x else -1, cell + 1 if x + 1 < width else -1):
+                if 0 <= other < size and not blocked[other] and d < distance[other]:
+                    distance[other] = d
+                    heappush(heap, (d, other))
+
+    def best_neighbour(self, cell):
+        size = len(self.blocked)
+        return min((self.distance[other] for other in neighbours(cell, self.width, size)), default=UNREACHABLE)
+
+    def tile_changed(self, cell):
+        if self.blocked[cell]:
+            self.close(cell)
+        else:
+            self.open(cell)
+
+    def open(self, cell):
+        d = 0 if cell in self.goals else self.best_neighbour(cell)
+        if d == UNREACHABLE:
+            return
+        d += cell not in self.goals
+        self.distance[cell] = d
+        self.propagate([(d, cell)])
+
+    def close(self, cell):
+        distance, width, size = self.distance, self.width, len(self.blocked)
+        if distance[cell] == UNREACHABLE:
+            return
+
+        # cells downhill of the closed one lose their distance unless another neighbour one step
+        # closer still holds; the queue goes level by level, so that neighbour's fate is already known
+        stale = [cell]
+        seen = {cell}
+        for stale_cell in stale:
+            d = distance[stale_cell]
+            for other in neighbours(stale_cell, width, size):
+                if other in seen or distance[other] != d + 1:
+                    continue
+                if any(distance[parent] == d and parent not in seen
+                       for parent in neighbours(other, width, size)):
+                    continue
+                seen.add(other)
+                stale.append(other)
+        for stale_cell in stale:
+            distance[stale_cell] = UNREACHABLE
+
+        heap = []
+        for stale_cell in stale:
+            if self.blocked[stale_cell]:
+                continue
+            d = 0 if stale_cell in self.goals else self.best_neighbour(stale_cell)
+            if d < UNREACHABLE:
+                d += stale_cell not in self.goals
+                distance[stale_cell] = d
+                heappush(heap, (d, stale_cell))
+        self.propagate(heap)
+
+    def downhill(self, cell):
+        distance = self.distance
+        best, best_distance = None, distance[cell]
+        for other in neighbours(cell, self.width, len(self.blocked)):
+            if distance[other] < best_distance:
+                best, best_distance = other, distance[other]
+        return best
+
+
+class PathGrid:
+    def __init__(self, blocked, width, x0=0, y0=0, cache_maps=16):
+        self.blocked = bytearray(blocked)
+        self.width = width
+        self.height = len(self.blocked) // width
+        self.x0 = x0
+        self.y0 = y0
+        self.cache_maps = cache_maps
+        self.maps = OrderedDict()
+
+    def contains(self, x, y):
+        return self.x0 <= x < self.x0 + self.width and self.y0 <= y < self.y0 + self.height
+
+    def cell(self, x, y):
+        return (y - self.y0) * self.width + x - self.x0
+
+    def point(self, cell):
+        return cell % self.width + self.x0, cell // self.width + self.y0
+
+    def set_blocked(self, x, y, blocked):
+        cell = self.cell(x, y)
+        if self.blocked[cell] == blocked:
+            return
+        self.blocked[cell] = blocked
+        for dijkstra_map in self.maps.values():
+            dijkstra_map.tile_changed(cell)
+
+    def path(self, start, goal):
+        if not self.contains(*goal):
+            return None
+        cells = astar(self.blocked, self.width, self.cell(*start), self.cell(*goal))
+        return None if cells is None else [self.point(cell) for cell in cells]
+
+    def nearest(self, start, explored):
+        cells = nearest(self.blocked, self.width, self.cell(*start), explored)
+        return None if cells is None else [self.point(cell) for cell in cells]
+
+    def distance_map(self, goals):
+        key = frozenset(self.cell(x, y) for x, y in goals if self.contains(x, y))
+        dijkstra_map = self.maps.get(key)
+        if dijkstra_map is not None:
+            self.maps.move_to_end(key)
+            return dijkstra_map
+
+        dijkstra_map = DijkstraMap(self.blocked, self.width, key)
+        self.maps[key] = dijkstra_map
+        while len(self.maps) > self.cache_maps:
+            self.maps.popitem(last=False)
+        return dijkstra_map
+
+    def distance(self, goals, x, y):
+        d = self.distance_map(goals).distance[self.cell(x, y)]
+        return None if d == UNREACHABLE else d
+
+    def step_towards(self, goals, x, y):
+        cell = self.distance_map(goals).downhill(self.cell(x, y))
+        return None if cell is None else self.point(cell)
@@ -0,0 +1,66 @@
+import sys
+
+CLEAR_SCREEN = '\x1b[2J'
+CLEAR_LINE_END = '\x1b[K'
+HIDE_CURSOR = '\x1b[?25l'
+SHOW_CURSOR = '\x1b[?25h'
+
+
+def move_to(row, col):
+    return f'\x1b[{row + 1};{col + 1}H'
+
+
+def changed_spans(old, new, gap=4):
+    spans = []
+    start = None
+    end = 0
+    for i, (old_char, new_char) in enumerate(zip(old, new)):
+        if old_char == new_char:
+            continue
+        if start is None:
+            start = i
+        elif i - end > gap:
+            spans.append((start, end))
+            start = i
+        end = i + 1
+    if start is not None:
+        spans.append((start, end))
+    return spans
+
+
+class TerminalRenderer:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lines = None
+
+    def reset(self):
+        self.lines = None
+
+    def frame_diff(self, lines):
+        if self.lines is None or len(self.lines) != len(lines):
+            return [HIDE_CURSOR, CLEAR_SCREEN] + [move_to(row, 0) + line for row, line in enumerate(lines)]
+
+        parts = []
+        for row, (old, new) in enumerate(zip(self.lines, lines)):
+            if old == new:
+                continue
+            if len(old) != len(new):
+                parts.append(move_to(row, 0) + new + CLEAR_LINE_END)
+                continue
+            for start, end in changed_spans(old, new):
+                parts.append(move_to(row, start) + new[start:end])
+        return parts
+
+    def draw(self, lines):
+        parts = self.frame_diff(lines)
+        self.lines = list(lines)
+        if parts:
+            parts.append(move_to(len(lines), 0))
+            self.stream.write(''.join(parts))
+            self.stream.flush()
+        return len(parts)
+
+    def close(self):
+        self.stream.write(SHOW_CURSOR)
+        self.stream.flush()
+        self.lines = None
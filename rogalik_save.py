@@ -0,0 +1,104 @@
+import mmap
+import os
+import struct
+
+from rogalik import Roguelike, np
+from rogalik_bits import BitMask
+
+MAGIC = b'RGLK'
+VERSION = 2
+# magic, version, flags, width, height, player x, player y, fov radius, turn, seed
+HEADER = struct.Struct('<4sHHIIiiHIQ')
+WORLD_HEADER = struct.Struct('<HI')
+# chunk x, chunk y, length of the packed chunk that follows
+CHUNK_HEADER = struct.Struct('<iiI')
+
+CHUNKED_FLAG = 1
+SHADOW_FLAG = 2
+SEED_FLAG = 4
+
+
+def mask_bytes(game, mask):
+    if game.use_numpy:
+        return np.packbits(mask, bitorder='little').tobytes()
+    return mask.to_bytes()
+
+
+def wall_bytes(game):
+    if game.use_numpy:
+        return mask_bytes(game, game.map == game.WALL)
+    walls = BitMask(game.WIDTH, game.HEIGHT)
+    for y, row in enumerate(game.map):
+        for x, tile in enumerate(row):
+            if tile == game.WALL:
+                walls.set(x, y)
+    return walls.to_bytes()
+
+
+def save_game(game, path):
+    # the chunked world draws its own seed when none is given and names chunk files after it
+    seed = game.world.seed if game.world else game.seed
+    flags = 0
+    if game.world:
+        flags |= CHUNKED_FLAG
+    if game.fov_mode == 'shadow':
+        flags |= SHADOW_FLAG
+    if seed is not None:
+        flags |= SEED_FLAG
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, game.WIDTH, game.HEIGHT, game.playerX, game.playerY,
+                            game.FOV_RADIUS, game.turn, seed if seed is not None else 0))
+        if game.world:
+            # only changed chunks are stored; the rest are generated again from the seed
+            chunks = list(game.world.stored())
+            f.write(WORLD_HEADER.pack(game.world.chunk_size, len(chunks)))
+            for chunk_x, chunk_y, chunk in chunks:
+                f.write(CHUNK_HEADER.pack(chunk_x, chunk_y, len(chunk)) + chunk)
+        else:
+            f.write(wall_bytes(game))
+            f.write(mask_bytes(game, game.explored))
+    os.replace(tmp_path, path)
+
+
+def unpack_mask(data, offset, width, height):
+    size = (width * height + 7) // 8
+    bits = np.unpackbits(np.frombuffer(data, np.uint8, size, offset), count=width * height, bitorder='little')
+    return bits.view(bool).reshape(height, width)
+
+
+def load_game(path, **options):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version, flags, width, height, player_x, player_y, radius, turn, seed = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} не является сохранением Roguelike версии {VERSION}")
+        offset = HEADER.size
+
+        options.setdefault('fov_mode', 'shadow' if flags & SHADOW_FLAG else 'ray')
+        options['seed'] = seed if flags & SEED_FLAG else None
+        if flags & CHUNKED_FLAG:
+            chunk_size, count = WORLD_HEADER.unpack_from(data, offset)
+            offset += WORLD_HEADER.size
+            game = Roguelike(width, height, radius, chunked=True, chunk_size=chunk_size, generate=False, **options)
+            for _ in range(count):
+                chunk_x, chunk_y, length = CHUNK_HEADER.unpack_from(data, offset)
+                offset += CHUNK_HEADER.size
+                game.world.restore(chunk_x, chunk_y, data[offset:offset + length])
+                offset += length
+        else:
+            game = Roguelike(width, height, radius, generate=False, **options)
+            size = (width * height + 7) // 8
+            if game.use_numpy:
+                game.map[:] = np.where(unpack_mask(data, offset, width, height), game.WALL, game.FLOOR)
+                game.explored[:] = unpack_mask(data, offset + size, width, height)
+            else:
+                walls = BitMask(width, height, data[offset:offset + size])
+                game.map = [[game.WALL if walls.test(x, y) else game.FLOOR for x in range(width)]
+                            for y in range(height)]
+                game.explored = BitMask(width, height, data[offset + size:offset + 2 * size])
+            game.map[player_y][player_x] = game.PLAYER
+
+    game.playerX, game.playerY, game.turn = player_x, player_y, turn
+    game.update_fov()
+    return game
@@ -0,0 +1,164 @@
+import os
+import random
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from rogalik_mapgen import chunk_walls
+
+CHUNK_SIZE = 32
+
+
+class Chunk:
+    def __init__(self, walls, explored=None):
+        self.walls = walls
+        self.explored = explored if explored is not None else np.zeros(walls.shape, dtype=bool)
+        self.dirty = False
+
+    def to_bytes(self):
+        return np.packbits(self.walls).tobytes() + np.packbits(self.explored).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, size):
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        cells = size * size
+        half = len(bits) // 2
+        walls = bits[:cells].astype(bool).reshape(size, size)
+        explored = bits[half:half + cells].astype(bool).reshape(size, size)
+        return cls(walls, explored)
+
+
+class ChunkedWorld:
+    def __init__(self, seed=None, chunk_size=CHUNK_SIZE, cache_chunks=64, path=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.chunk_size = chunk_size
+        self.cache_chunks = cache_chunks
+        self.path = path or tempfile.mkdtemp(prefix='rogalik_world_')
+        os.makedirs(self.path, exist_ok=True)
+        # a directory made here only holds evicted chunks and goes away with the world
+        self.cleanup = None if path else weakref.finalize(self, shutil.rmtree, self.path, True)
+        self.chunks = OrderedDict()
+        self.generated = 0
+        self.loaded = 0
+        self.evicted = 0
+
+    def chunk_path(self, chunk_x, chunk_y):
+        return os.path.join(self.path, f'{self.seed}_{chunk_x}_{chunk_y}.chunk')
+
+    def chunk(self, chunk_x, chunk_y):
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        path = self.chunk_path(chunk_x, chunk_y)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                chunk = Chunk.from_bytes(f.read(), self.chunk_size)
+            self.loaded += 1
+        else:
+            chunk = Chunk(chunk_walls(self.chunk_size, self.seed, chunk_x, chunk_y))
+            self.generated += 1
+
+        self.chunks[key] = chunk
+        while len(self.chunks) > self.cache_chunks:
+            self.evict(*self.chunks.popitem(last=False))
+        return chunk
+
+    def save(self, key, chunk):
+        with open(self.chunk_path(*key), 'wb') as f:
+            f.write(chunk.to_bytes())
+        chunk.dirty = False
+
+    def evict(self, key, chunk):
+        self.evicted += 1
+        if chunk.dirty:
+            self.save(key, chunk)
+
+    def flush(self):
+        for key, chunk in self.chunks.items():
+            if chunk.dirty:
+                self.save(key, chunk)
+
+    def stored(self):
+        # chunks that differ from what the seed generates, as (chunk_x, chunk_y, bytes)
+        self.flush()
+        prefix = f'{self.seed}_'
+        for name in sorted(os.listdir(self.path)):
+            if name.startswith(prefix) and name.endswith('.chunk'):
+                chunk_x, chunk_y = map(int, name[len(prefix):-len('.chunk')].split('_'))
+                with open(os.path.join(self.path, name), 'rb') as f:
+                    yield chunk_x, chunk_y, f.read()
+
+    def restore(self, chunk_x, chunk_y, data):
+        self.chunks.pop((chunk_x, chunk_y), None)
+        with open(self.chunk_path(chunk_x, chunk_y), 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        if self.cleanup:
+            self.cleanup()
+        else:
+            self.flush()
+        self.chunks.clear()
+
+    def locate(self, x, y):
+        size = self.chunk_size
+        return self.chunk(x // size, y // size), y % size, x % size
+
+    def is_wall(self, x, y):
+        chunk, row, col = self.locate(x, y)
+        return bool(chunk.walls[row, col])
+
+    def set_wall(self, x, y, wall):
+        chunk, row, col = self.locate(x, y)
+        chunk.walls[row, col] = wall
+        chunk.dirty = True
+
+    def spans(self, x0, y0, x1, y1):
+        size = self.chunk_size
+        for chunk_y in range(y0 // size, (y1 - 1) // size + 1):
+            for chunk_x in range(x0 // size, (x1 - 1) // size + 1):
+                left, top = chunk_x * size, chunk_y * size
+                cx0, cy0 = max(x0, left), max(y0, top)
+                cx1, cy1 = min(x1, left + size), min(y1, top + size)
+                yield (self.chunk(chunk_x, chunk_y),
+                       (slice(cy0 - top, cy1 - top), slice(cx0 - left, cx1 - left)),
+                       (slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)))
+
+    def walls(self, x0, y0, x1, y1):
+        out = np.empty((y1 - y0, x1 - x0), dtype=bool)
+        for chunk, inner, outer in self.spans(x0, y0, x1, y1):
+            out[outer] = chunk.walls[inner]
+        return out
+
+    def explored(self, x0, y0, x1, y1):
+        out = np.empty((y1 - y0, x1 - x0), dtype=bool)
+        for chunk, inner, outer in self.spans(x0, y0, x1, y1):
+            out[outer] = chunk.explored[inner]
+        return out
+
+    def mark_explored(self, x0, y0, mask):
+        for chunk, inner, outer in self.spans(x0, y0, x0 + mask.shape[1], y0 + mask.shape[0]):
+            seen = mask[outer]
+            if not chunk.explored[inner][seen].all():
+                chunk.explored[inner] |= seen
+                chunk.dirty = True
+
+    def explored_count(self):
+        self.flush()
+        count = sum(int(chunk.explored.sum()) for chunk in self.chunks.values())
+        cached = {self.chunk_path(*key) for key in self.chunks}
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if name.startswith(f'{self.seed}_') and path not in cached:
+                with open(path, 'rb') as f:
+                    count += int(Chunk.from_bytes(f.read(), self.chunk_size).explored.sum())
+        return count